@@ -28,7 +28,9 @@ from .trade_aggregator import (
     TraderMetrics
 )
 from .trader_ranker import (
+    NUMPY_AVAILABLE,
     rank_traders,
+    bot_score_array,
     get_likely_bots,
     format_trader_table,
     format_bot_details,
@@ -121,7 +123,8 @@ def main():
     print("-" * 40)
 
     ranked = rank_traders(combined_traders)
-    likely_bots = get_likely_bots(ranked)
+    bot_scores = bot_score_array(ranked) if NUMPY_AVAILABLE else None
+    likely_bots = get_likely_bots(ranked, scores=bot_scores)
 
     print(f"Traders ranked: {len(ranked)}")
     print(f"Likely bots (score >= 70): {len(likely_bots)}")
@@ -3,11 +3,32 @@ Rank traders and compute bot-likelihood scores.
 """
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
 
 from .trade_aggregator import TraderMetrics
 from .config import BOT_SCORE_THRESHOLDS
 
+# Thresholds bound once at import (see reload_thresholds)
+_TH_MAKER = BOT_SCORE_THRESHOLDS["high_maker_ratio"]
+_TH_TRADES = BOT_SCORE_THRESHOLDS["high_trade_count"]
+_TH_BAL = BOT_SCORE_THRESHOLDS["balanced_positions"]
+_TH_FAST = BOT_SCORE_THRESHOLDS["fast_trading"]
+
+
+def reload_thresholds():
+    """Re-read BOT_SCORE_THRESHOLDS after it has been modified at runtime."""
+    global _TH_MAKER, _TH_TRADES, _TH_BAL, _TH_FAST
+    _TH_MAKER = BOT_SCORE_THRESHOLDS["high_maker_ratio"]
+    _TH_TRADES = BOT_SCORE_THRESHOLDS["high_trade_count"]
+    _TH_BAL = BOT_SCORE_THRESHOLDS["balanced_positions"]
+    _TH_FAST = BOT_SCORE_THRESHOLDS["fast_trading"]
+
 
 @dataclass
 class RankedTrader:
@@ -60,14 +81,14 @@ def compute_bot_score(metrics: TraderMetrics) -> tuple[float, List[str]]:
     indicators = []
 
     # 1. High maker ratio (+20 points)
-    if metrics.maker_ratio > BOT_SCORE_THRESHOLDS["high_maker_ratio"]:
+    if metrics.maker_ratio > _TH_MAKER:
         score += 20
         indicators.append(f"High maker ratio ({metrics.maker_ratio:.0%})")
     elif metrics.maker_ratio > 0.5:
         score += 10
 
     # 2. High trade count (+25 points max)
-    threshold = BOT_SCORE_THRESHOLDS["high_trade_count"]
+    threshold = _TH_TRADES
     if metrics.total_trades > threshold * 5:
         score += 25
         indicators.append(f"Very high trade frequency ({metrics.total_trades:,} trades)")
@@ -78,7 +99,7 @@ def compute_bot_score(metrics: TraderMetrics) -> tuple[float, List[str]]:
         score += 10
 
     # 3. Balanced positions - arbitrage signal (+20 points)
-    balance_threshold = BOT_SCORE_THRESHOLDS["balanced_positions"]
+    balance_threshold = _TH_BAL
     if metrics.position_balance_ratio > balance_threshold:
         score += 20
         indicators.append(f"Balanced positions (arbitrage pattern, ratio {metrics.position_balance_ratio:.2f})")
@@ -87,7 +108,7 @@ def compute_bot_score(metrics: TraderMetrics) -> tuple[float, List[str]]:
         indicators.append(f"Somewhat balanced positions (ratio {metrics.position_balance_ratio:.2f})")
 
     # 4. Fast trading (+20 points)
-    trades_per_min_threshold = BOT_SCORE_THRESHOLDS["fast_trading"]
+    trades_per_min_threshold = _TH_FAST
     if metrics.trades_per_minute > trades_per_min_threshold:
         score += 20
         indicators.append(f"Fast trading ({metrics.trades_per_minute:.1f} trades/min)")
@@ -139,9 +160,10 @@ def rank_traders(traders: Dict[str, TraderMetrics]) -> List[RankedTrader]:
     trades_rank = {t.wallet: i + 1 for i, t in enumerate(by_trades)}
     pnl_rank = {t.wallet: i + 1 for i, t in enumerate(by_pnl)}
 
-    # Create RankedTrader objects
+    # Create RankedTrader objects in volume order, so the output needs no
+    # further sort
     ranked = []
-    for metrics in trader_list:
+    for metrics in by_volume:
         bot_score, bot_indicators = compute_bot_score(metrics)
 
         ranked.append(RankedTrader(
@@ -154,16 +176,29 @@ def rank_traders(traders: Dict[str, TraderMetrics]) -> List[RankedTrader]:
             bot_indicators=bot_indicators
         ))
 
-    # Sort by volume for output
-    ranked.sort(key=lambda r: r.metrics.total_volume_usdc, reverse=True)
-
     return ranked
 
 
-def get_likely_bots(ranked: List[RankedTrader], threshold: float = 70.0) -> List[RankedTrader]:
+def bot_score_array(ranked: List[RankedTrader]):
+    """
+    Bot scores as a float array aligned with `ranked` (requires numpy).
+    """
+    return np.fromiter((r.bot_score for r in ranked), dtype=float, count=len(ranked))
+
+
+def get_likely_bots(
+    ranked: List[RankedTrader],
+    threshold: float = 70.0,
+    scores: Optional[Sequence[float]] = None
+) -> List[RankedTrader]:
     """
     Filter traders likely to be bots (score >= threshold).
+
+    If `scores` (from bot_score_array) is given and numpy is available,
+    the threshold is applied as a vectorized mask. Ordering is preserved.
     """
+    if scores is not None and NUMPY_AVAILABLE:
+        return [ranked[i] for i in np.flatnonzero(np.asarray(scores) >= threshold)]
     return [r for r in ranked if r.bot_score >= threshold]
 
 
@@ -255,18 +290,18 @@ def format_trader_table_with_profiles(
     lines.append(header)
     lines.append(separator)
 
-    for i, r in enumerate(ranked[:limit], 1):
-        session_pnl = _format_pnl(r.metrics.realized_pnl)
-        alltime_pnl = _format_pnl(r.pnl_all_time)
-
-        # Get username from profile
-        profile = profiles.get(r.wallet.lower())
-        username = f"@{profile.username}" if profile and profile.username else r.short_wallet
+    profiles_get = profiles.get
+    format_pnl = _format_pnl
+    append = lines.append
 
-        lines.append(
-            f"{i:>4} | {username:<16} | ${r.metrics.total_volume_usdc:>9,.0f} | "
-            f"{session_pnl:>9} | {alltime_pnl:>10} | "
-            f"{r.metrics.total_trades:>6,} | {r.bot_score:>3.0f}"
+    for i, r in enumerate(ranked[:limit], 1):
+        m = r.metrics
+        profile = profiles_get(r.wallet.lower())
+        append(
+            f"{i:>4} | {'@' + profile.username if profile and profile.username else r.short_wallet:<16} | "
+            f"${m.total_volume_usdc:>9,.0f} | "
+            f"{format_pnl(m.realized_pnl):>9} | {format_pnl(r.pnl_all_time):>10} | "
+            f"{m.total_trades:>6,} | {r.bot_score:>3.0f}"
         )
 
     return "\n".join(lines)
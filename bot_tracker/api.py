@@ -3,44 +3,91 @@ FastAPI REST endpoints for the bot tracker dashboard.
 """
 
 import os
+import base64
 import secrets
 import asyncio
+import functools
+import hashlib
 import json
-from typing import List, Optional, Set
+import time
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Set
 from datetime import datetime
 from pathlib import Path
 
-from fastapi import FastAPI, HTTPException, Depends, WebSocket, WebSocketDisconnect, status
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
-from .config import TARGET_WALLETS, MARKET_SLUGS_PATTERN, BUY_ONLY
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# orjson-backed default responses, except on FastAPI versions that deprecate
+# ORJSONResponse (they serialize natively via Pydantic, which is faster)
+_app_options = {}
+if ORJSON_AVAILABLE:
+    from fastapi.responses import ORJSONResponse
+    if not getattr(ORJSONResponse, "__deprecated__", None):
+        _app_options["default_response_class"] = ORJSONResponse
+
+from .config import TARGET_WALLETS, TARGET_WALLET_SET, MARKET_SLUGS_PATTERN, BUY_ONLY
 
 # Password protection (set via environment variable)
 AUTH_USERNAME = os.getenv("AUTH_USERNAME", "admin")
 AUTH_PASSWORD = os.getenv("AUTH_PASSWORD", "")  # Empty = no auth required
 
-security = HTTPBasic()
+# Digests computed once; None means auth is disabled
+_AUTH_USER_HASH = hashlib.sha256(AUTH_USERNAME.encode()).digest()
+_AUTH_PASS_HASH = hashlib.sha256(AUTH_PASSWORD.encode()).digest() if AUTH_PASSWORD else None
 
+# Paths that require auth when AUTH_PASSWORD is set
+PROTECTED_PATHS = {"/"}
 
-def verify_credentials(credentials: HTTPBasicCredentials = Depends(security)):
-    """Verify HTTP Basic Auth credentials."""
-    if not AUTH_PASSWORD:  # No password set = no auth required
+
+def verify_credentials(authorization: Optional[str]) -> bool:
+    """Verify an HTTP Basic Authorization header value."""
+    if _AUTH_PASS_HASH is None:  # No password set = no auth required
         return True
 
-    correct_username = secrets.compare_digest(credentials.username, AUTH_USERNAME)
-    correct_password = secrets.compare_digest(credentials.password, AUTH_PASSWORD)
+    scheme, _, encoded = (authorization or "").partition(" ")
+    if scheme.lower() != "basic":
+        return False
+    try:
+        username, _, password = base64.b64decode(encoded).decode().partition(":")
+    except (ValueError, UnicodeDecodeError):
+        return False
+
+    # Compare fixed-length digests and combine with & so both checks always
+    # run and neither length nor a wrong username leaks through timing
+    correct_username = secrets.compare_digest(
+        hashlib.sha256(username.encode()).digest(), _AUTH_USER_HASH
+    )
+    correct_password = secrets.compare_digest(
+        hashlib.sha256(password.encode()).digest(), _AUTH_PASS_HASH
+    )
+    return bool(correct_username & correct_password)
 
-    if not (correct_username and correct_password):
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid credentials",
-            headers={"WWW-Authenticate": "Basic"},
-        )
-    return True
+
+def _json_default(obj):
+    """Fallback encoder for pydantic models and datetimes."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    return str(obj)
+
+
+def _dumps(obj) -> bytes:
+    """Serialize to JSON bytes (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_json_default)
+    return json.dumps(obj, default=_json_default).encode()
 
 
 # WebSocket connection manager for real-time updates
@@ -57,18 +104,25 @@ class ConnectionManager:
     def disconnect(self, websocket: WebSocket):
         self.active_connections.discard(websocket)
 
-    async def broadcast(self, message: dict):
-        """Broadcast message to all connected clients."""
-        dead_connections = set()
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception:
-                dead_connections.add(connection)
+    async def broadcast(self, message):
+        """Broadcast a message (dict or pre-encoded JSON bytes) to all connected clients concurrently."""
+        # Snapshot: disconnect() may run while the sends are awaited
+        connections = tuple(self.active_connections)
+        if not connections:
+            return
+
+        # Encode once, then send to all clients at once so one slow client
+        # doesn't stall the rest
+        payload = (message if isinstance(message, bytes) else _dumps(message)).decode()
+        results = await asyncio.gather(
+            *(connection.send_text(payload) for connection in connections),
+            return_exceptions=True
+        )
 
         # Clean up dead connections
-        for conn in dead_connections:
-            self.active_connections.discard(conn)
+        for conn, result in zip(connections, results):
+            if isinstance(result, Exception):
+                self.active_connections.discard(conn)
 
     def get_count(self) -> int:
         return len(self.active_connections)
@@ -91,7 +145,8 @@ from .models import (
 app = FastAPI(
     title="Bot Trading Tracker API",
     description="Real-time bot trading analysis for Polymarket",
-    version="0.1.0"
+    version="0.1.0",
+    **_app_options
 )
 
 # Add CORS middleware for frontend access
@@ -103,16 +158,131 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+class BasicAuthMiddleware:
+    """Enforce HTTP Basic Auth on PROTECTED_PATHS.
+
+    Plain ASGI rather than @app.middleware("http"), so every other request
+    and WebSocket passes straight through without being wrapped.
+    """
+
+    _UNAUTHORIZED = Response(
+        content=b'{"detail":"Invalid credentials"}',
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        media_type="application/json",
+        headers={"WWW-Authenticate": "Basic"},
+    )
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in PROTECTED_PATHS:
+            authorization = None
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    authorization = value.decode("latin-1")
+                    break
+            if not verify_credentials(authorization):
+                await self._UNAUTHORIZED(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
+
+# Only installed when a password is configured
+if _AUTH_PASS_HASH is not None:
+    app.add_middleware(BasicAuthMiddleware)
+
 # These will be injected by main.py
 position_tracker = None
 pattern_detector = None
 market_fetcher = None
 ws_server = None
 start_time = None
-trade_history: List[TradeEvent] = []
+MAX_TRADE_HISTORY = 2000
+trade_history: Deque[TradeEvent] = deque(maxlen=MAX_TRADE_HISTORY)  # newest first
+trade_ids: Set[str] = set()  # ids of trades in trade_history (O(1) dedup)
+# Per-wallet / per-market views of trade_history (same newest-first order)
+trades_by_wallet: Dict[str, Deque[TradeEvent]] = {}
+trades_by_market: Dict[str, Deque[TradeEvent]] = {}
+# Earliest / latest trade per market, maintained incrementally for tracking-info
+market_first_trade: Dict[str, TradeEvent] = {}
+market_last_trade: Dict[str, TradeEvent] = {}
+# Encoded JSON per trade id in trade_history, filled on the event loop as
+# trades enter the history and shared by the trade list endpoints and the
+# "trade" WebSocket event (trades never change)
+trade_json: Dict[str, bytes] = {}
 price_stream = None
 storage = None
 
+# Bumped whenever trade history or tracked wallets change (used for ETags)
+_trade_version = 0
+# Bumped only when the tracked wallet list changes (/api/wallets ETag)
+_wallet_version = 0
+
+
+def _bump_version():
+    """Invalidate ETags for endpoints derived from trades/wallets."""
+    global _trade_version
+    _trade_version += 1
+
+
+def _not_modified(request: Request, response: Response, *parts) -> Optional[Response]:
+    """Set the ETag header (built from parts) and return a 304 response if the client copy is current."""
+    etag = 'W/"' + "-".join(str(p) for p in parts) + '"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    return None
+
+
+def json_response(obj) -> Response:
+    """Encode trusted internal data directly, skipping response_model validation."""
+    return Response(content=_dumps(obj), media_type="application/json")
+
+
+def stream_json_list(items):
+    """Yield a JSON array one encoded item at a time (items must be a snapshot)."""
+    yield b"["
+    first = True
+    for item in items:
+        if not first:
+            yield b","
+        first = False
+        yield _dumps(item)
+    yield b"]"
+
+
+def ttl_cache(seconds: float):
+    """Cache an endpoint's serialized JSON for `seconds`.
+
+    Keyed on the call arguments and _trade_version, so new trades
+    invalidate the cache immediately. The endpoint may return data or
+    already-encoded JSON bytes.
+    """
+    def decorator(func):
+        cache = {}  # key -> (expires_at, body)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (_trade_version, args, tuple(sorted(kwargs.items())))
+            now = time.monotonic()
+            hit = cache.get(key)
+            if hit and hit[0] > now:
+                return Response(content=hit[1], media_type="application/json")
+
+            result = func(*args, **kwargs)
+            body = result if isinstance(result, bytes) else _dumps(result)
+            # Drop expired entries so varying args can't grow the cache forever
+            for k, (expires, _) in list(cache.items()):
+                if expires <= now:
+                    cache.pop(k, None)
+            cache[key] = (now + seconds, body)
+            return Response(content=body, media_type="application/json")
+
+        return wrapper
+    return decorator
+
 
 def set_dependencies(pos_tracker, pat_detector, mkt_fetcher, websocket_server, start):
     """Inject dependencies from main.py."""
@@ -141,7 +311,7 @@ def set_market_resolver(resolver):
 
 def set_storage(store):
     """Set reference to storage for price endpoint."""
-    global storage, trade_history
+    global storage
     storage = store
 
     # Load historical data from storage on startup
@@ -150,6 +320,7 @@ def set_storage(store):
             # Load ALL trades from storage
             stored_trades = store.get_all_trades()
             all_trade_ids = set()
+            loaded_trades = []
 
             if stored_trades:
                 # Convert stored dicts back to TradeEvent objects
@@ -173,15 +344,19 @@ def set_storage(store):
                             market_slug=trade_dict.get("market_slug", ""),
                             market_question=trade_dict.get("market_question", "")
                         )
-                        trade_history.append(trade)
+                        loaded_trades.append(trade)
                         all_trade_ids.add(trade.id)
                     except Exception as e:
                         print(f"Error loading trade: {e}")
 
                 # Sort by timestamp descending (newest first) for trade_history
-                trade_history.sort(key=lambda t: t.timestamp, reverse=True)
+                loaded_trades.sort(key=lambda t: t.timestamp, reverse=True)
                 # Keep only last 2000 for in-memory history (but we loaded all for positions)
-                trade_history = trade_history[:2000]
+                trade_history.extend(loaded_trades[:MAX_TRADE_HISTORY])
+                for trade in trade_history:
+                    trade_ids.add(trade.id)
+                    _encode_trade(trade)
+                    _index_trade(trade, newest=False)
                 print(f"Loaded {len(trade_history)} trades for history (total in storage: {len(stored_trades)})")
 
                 # Populate trade_poller's seen_trade_ids to prevent duplicate processing
@@ -217,8 +392,7 @@ def set_storage(store):
                             avg_down_price=float(pos_dict.get("avg_down_price", 0)),
                             combined_price=float(pos_dict.get("combined_price", 0))
                         )
-                        # Add to position tracker's nested dict: positions[wallet][market_slug]
-                        position_tracker.positions[wallet][market_slug] = position
+                        position_tracker.restore_position(position)
                         positions_loaded += 1
                     except Exception as e:
                         print(f"Error loading position {key}: {e}")
@@ -227,17 +401,89 @@ def set_storage(store):
         except Exception as e:
             print(f"Error loading data from storage: {e}")
 
+        _bump_version()
+
+
+def _index_trade(trade: TradeEvent, newest: bool = True):
+    """Add a trade to the per-wallet and per-market indexes."""
+    for index, key in ((trades_by_wallet, trade.wallet.lower()), (trades_by_market, trade.market_slug)):
+        bucket = index.get(key)
+        if bucket is None:
+            bucket = index[key] = deque()
+        if newest:
+            bucket.appendleft(trade)
+        else:
+            bucket.append(trade)
+
+    slug = trade.market_slug
+    first = market_first_trade.get(slug)
+    if first is None or trade.timestamp < first.timestamp:
+        market_first_trade[slug] = trade
+    last = market_last_trade.get(slug)
+    if last is None or trade.timestamp > last.timestamp:
+        market_last_trade[slug] = trade
+
+
+def _unindex_oldest(trade: TradeEvent):
+    """Remove a trade evicted from trade_history (always the oldest in its buckets)."""
+    for index, key in ((trades_by_wallet, trade.wallet.lower()), (trades_by_market, trade.market_slug)):
+        bucket = index.get(key)
+        if bucket:
+            bucket.pop()
+            if not bucket:
+                del index[key]
+
+    # Only rescan the market if its earliest/latest trade was the one evicted
+    slug = trade.market_slug
+    remaining = trades_by_market.get(slug)
+    if not remaining:
+        market_first_trade.pop(slug, None)
+        market_last_trade.pop(slug, None)
+        return
+    if market_first_trade.get(slug) is trade:
+        market_first_trade[slug] = min(remaining, key=lambda t: t.timestamp)
+    if market_last_trade.get(slug) is trade:
+        market_last_trade[slug] = max(remaining, key=lambda t: t.timestamp)
+
+
+def _encode_trade(trade: TradeEvent):
+    """Cache a history trade's JSON (event loop only, as trades enter trade_history)."""
+    trade_json[trade.id] = trade.model_dump_json().encode()
+
+
+def _trade_bytes(trade: TradeEvent) -> bytes:
+    """A trade's JSON from the cache, encoded on the spot if it isn't cached.
+
+    Never writes the cache: it runs in threadpool endpoints too, which must
+    not race the loop's evictions.
+    """
+    body = trade_json.get(trade.id)
+    if body is None:
+        body = trade.model_dump_json().encode()
+    return body
+
+
+def _dumps_trades(trades) -> bytes:
+    """Encode a snapshot of trades as a JSON array from the per-trade cache."""
+    return b"[" + b",".join(map(_trade_bytes, trades)) + b"]"
+
 
 def add_trade_to_history(trade: TradeEvent):
     """Add a trade to the history (called from main.py)."""
-    global trade_history
     # Check if trade already exists (from loaded history)
-    if any(t.id == trade.id for t in trade_history[:100]):  # Only check recent
+    if trade.id in trade_ids:
         return
-    trade_history.insert(0, trade)
-    # Keep only last 2000 trades
-    if len(trade_history) > 2000:
-        trade_history = trade_history[:2000]
+    # Keep only last 2000 trades (deque drops the oldest on appendleft)
+    if len(trade_history) == MAX_TRADE_HISTORY:
+        evicted = trade_history[-1]
+        trade_ids.discard(evicted.id)
+        trade_json.pop(evicted.id, None)
+        _unindex_oldest(evicted)
+    trade_history.appendleft(trade)
+    trade_ids.add(trade.id)
+    _encode_trade(trade)
+    _index_trade(trade)
+    _bump_version()
 
 
 # ===== Status Endpoints =====
@@ -245,19 +491,20 @@ def add_trade_to_history(trade: TradeEvent):
 # Check if dashboard is built
 _dashboard_dist = Path(__file__).parent / "dashboard" / "dist"
 _dashboard_available = _dashboard_dist.exists()
-
-def optional_auth(credentials: HTTPBasicCredentials = Depends(security)):
-    """Optional auth - only enforced if AUTH_PASSWORD is set."""
-    if AUTH_PASSWORD:
-        return verify_credentials(credentials)
-    return True
-
+# index.html is immutable for the process lifetime - read it once
+_index_file = _dashboard_dist / "index.html"
+_index_bytes = _index_file.read_bytes() if _index_file.exists() else None
 
 @app.get("/")
-def root(auth: bool = Depends(optional_auth)):
+def root():
     """Root endpoint - serve dashboard if available, otherwise API info."""
-    if _dashboard_available:
-        return FileResponse(_dashboard_dist / "index.html")
+    if _index_bytes is not None:
+        # Always revalidate the shell so new asset hashes are picked up
+        return Response(
+            content=_index_bytes,
+            media_type="text/html",
+            headers={"Cache-Control": "no-cache"}
+        )
     return {
         "name": "Bot Trading Tracker API",
         "version": "0.1.0",
@@ -278,26 +525,86 @@ async def websocket_endpoint(websocket: WebSocket):
     await ws_manager.connect(websocket)
     try:
         while True:
-            # Keep connection alive, wait for messages (we don't expect any)
-            try:
-                await asyncio.wait_for(websocket.receive_text(), timeout=30)
-            except asyncio.TimeoutError:
-                # Send ping to keep alive
-                await websocket.send_json({"type": "ping"})
+            # We don't expect any messages; keepalive is handled by protocol
+            # PING frames (uvicorn ws_ping_interval/ws_ping_timeout)
+            await websocket.receive_text()
     except WebSocketDisconnect:
         ws_manager.disconnect(websocket)
     except Exception:
         ws_manager.disconnect(websocket)
 
 
-async def broadcast_to_websocket(event_type: str, data: dict):
-    """Broadcast an event to all WebSocket clients."""
-    await ws_manager.broadcast({"type": event_type, "data": data})
+# Events are queued and flushed by run_broadcast_flusher so bursts (e.g. a
+# resolved market with hundreds of trades) go out as a few batch frames
+BROADCAST_COALESCE_SECONDS = 0.05
+_broadcast_queue: asyncio.Queue = asyncio.Queue(maxsize=10000)
+
+
+async def broadcast_to_websocket(event_type: str, data):
+    """Queue an event for broadcast to all WebSocket clients.
+
+    `data` may be a dict or a pydantic model. It is encoded here, so the
+    queued event is a snapshot even if the model is mutated later.
+    """
+    if not ws_manager.get_count():
+        return  # Nobody listening - skip serialization entirely
+    if isinstance(data, TradeEvent):
+        data_json = _trade_bytes(data)
+    elif hasattr(data, "model_dump_json"):
+        data_json = data.model_dump_json().encode()
+    else:
+        data_json = _dumps(data)
+    event = b'{"type":' + _dumps(event_type) + b',"data":' + data_json + b'}'
+    try:
+        _broadcast_queue.put_nowait(event)
+    except asyncio.QueueFull:
+        print(f"Broadcast queue full, dropping {event_type} event")
+
+
+async def run_broadcast_flusher():
+    """Send queued events, coalescing everything queued since the last send.
+
+    Runs until cancelled; main.py starts it alongside the HTTP server.
+    """
+    while True:
+        events = [await _broadcast_queue.get()]
+        while True:
+            try:
+                events.append(_broadcast_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+
+        # Events are already encoded, so the batch envelope is just a join
+        if len(events) == 1:
+            message = events[0]
+        else:
+            message = b'{"type":"batch","events":[' + b",".join(events) + b"]}"
+        try:
+            await ws_manager.broadcast(message)
+        except Exception as e:
+            print(f"WebSocket broadcast error: {e}")
+
+        await asyncio.sleep(BROADCAST_COALESCE_SECONDS)
+
+
+# Serialized /api/status body reused for STATUS_CACHE_TTL: (expires_at, key, body).
+# No ETag: uptime_seconds changes on every request
+STATUS_CACHE_TTL = 0.5
+_status_cache = (0.0, None, b"")
 
 
 @app.get("/api/status", response_model=TrackerState)
 def get_status():
     """Get current tracker status."""
+    global _status_cache
+    connected_clients = ws_manager.get_count() if ws_server else 0
+    active_markets = len(market_fetcher.cache) if market_fetcher else 0
+    key = (_trade_version, len(TARGET_WALLETS), connected_clients, active_markets)
+    now = time.monotonic()
+    expires_at, cached_key, body = _status_cache
+    if now < expires_at and cached_key == key:
+        return Response(content=body, media_type="application/json")
+
     uptime = 0
     if start_time:
         uptime = (datetime.now() - start_time).total_seconds()
@@ -306,14 +613,17 @@ def get_status():
     if trade_history:
         last_trade_ts = trade_history[0].timestamp
 
-    return TrackerState(
-        connected_clients=ws_manager.get_count() if ws_server else 0,
+    state = TrackerState(
+        connected_clients=connected_clients,
         tracked_wallets=len(TARGET_WALLETS),
-        active_markets=len(market_fetcher.cache) if market_fetcher else 0,
+        active_markets=active_markets,
         total_trades_seen=len(trade_history),
         last_trade_ts=last_trade_ts,
         uptime_seconds=uptime
     )
+    body = _dumps(state.model_dump())
+    _status_cache = (now + STATUS_CACHE_TTL, key, body)
+    return Response(content=body, media_type="application/json")
 
 
 # ===== Price Stream Endpoints =====
@@ -409,43 +719,57 @@ def get_storage_info():
 
 # ===== Wallet Endpoints =====
 
+# Cached /api/wallets payload (invalidated in set_wallet)
+_wallets_cache: Optional[list] = None
+
+
 @app.get("/api/wallets")
-def get_wallets():
+def get_wallets(request: Request, response: Response):
     """Get list of tracked wallets."""
-    return [
-        {"address": addr, "name": name}
-        for addr, name in TARGET_WALLETS.items()
-    ]
+    global _wallets_cache
+    cached = _not_modified(request, response, _wallet_version)
+    if cached:
+        return cached
+
+    if _wallets_cache is None:
+        _wallets_cache = [
+            {"address": addr, "name": name}
+            for addr, name in TARGET_WALLETS.items()
+        ]
+    return _wallets_cache
 
 
-@app.get("/api/wallets/{wallet}/positions", response_model=List[WalletPosition])
+@app.get("/api/wallets/{wallet}/positions", responses={200: {"model": List[WalletPosition]}})
 def get_wallet_positions(wallet: str):
     """Get all positions for a specific wallet."""
     if not position_tracker:
         raise HTTPException(status_code=503, detail="Position tracker not initialized")
 
-    positions = position_tracker.get_wallet_positions(wallet)
-    if not positions:
-        return []
-    return positions
+    return json_response(position_tracker.get_wallet_positions(wallet) or [])
 
 
-@app.get("/api/wallets/{wallet}/trades", response_model=List[TradeEvent])
+@app.get("/api/wallets/{wallet}/trades", responses={200: {"model": List[TradeEvent]}})
 def get_wallet_trades(wallet: str, limit: int = 50):
     """Get recent trades for a specific wallet."""
-    wallet = wallet.lower()
-    wallet_trades = [t for t in trade_history if t.wallet.lower() == wallet]
-    return wallet_trades[:limit]
+    if wallet not in TARGET_WALLET_SET:
+        wallet = wallet.lower()
+    # Snapshot in one C call: the loop appends to these deques while
+    # sync endpoints run in the threadpool
+    body = _dumps_trades(tuple(islice(trades_by_wallet.get(wallet, ()), limit)))
+    return Response(content=body, media_type="application/json")
 
 
 # ===== Position Endpoints =====
 
-@app.get("/api/positions", response_model=List[WalletPosition])
+@app.get("/api/positions", responses={200: {"model": List[WalletPosition]}})
 def get_all_positions():
     """Get all current positions."""
     if not position_tracker:
         raise HTTPException(status_code=503, detail="Position tracker not initialized")
-    return position_tracker.get_all_positions()
+    return StreamingResponse(
+        stream_json_list(position_tracker.get_all_positions()),
+        media_type="application/json"
+    )
 
 
 @app.get("/api/positions/{wallet}/{market_slug}", response_model=Optional[WalletPosition])
@@ -463,6 +787,7 @@ def get_position(wallet: str, market_slug: str):
 # ===== Market Endpoints =====
 
 @app.get("/api/markets")
+@ttl_cache(1.0)
 def get_markets():
     """Get all tracked markets."""
     if not market_fetcher:
@@ -504,27 +829,28 @@ def get_market(slug: str):
     return market
 
 
-@app.get("/api/markets/{slug}/positions", response_model=List[WalletPosition])
+@app.get("/api/markets/{slug}/positions", responses={200: {"model": List[WalletPosition]}})
 def get_market_positions(slug: str):
     """Get all positions for a specific market."""
     if not position_tracker:
         raise HTTPException(status_code=503, detail="Position tracker not initialized")
-    return position_tracker.get_market_positions(slug)
+    return json_response(position_tracker.get_market_positions(slug))
 
 
 # ===== Trade Endpoints =====
 
-@app.get("/api/trades", response_model=List[TradeEvent])
+@app.get("/api/trades", responses={200: {"model": List[TradeEvent]}})
+@ttl_cache(1.0)
 def get_recent_trades(limit: int = 500):
     """Get recent trades across all wallets."""
-    return trade_history[:limit]
+    return _dumps_trades(tuple(islice(trade_history, limit)))
 
 
-@app.get("/api/trades/{market_slug}", response_model=List[TradeEvent])
+@app.get("/api/trades/{market_slug}", responses={200: {"model": List[TradeEvent]}})
 def get_market_trades(market_slug: str, limit: int = 100):
     """Get recent trades for a specific market."""
-    market_trades = [t for t in trade_history if t.market_slug == market_slug]
-    return market_trades[:limit]
+    body = _dumps_trades(tuple(islice(trades_by_market.get(market_slug, ()), limit)))
+    return Response(content=body, media_type="application/json")
 
 
 # ===== Pattern Endpoints =====
@@ -574,8 +900,15 @@ def get_hedge_pattern(wallet: str, market_slug: str):
 # ===== Summary Endpoints =====
 
 @app.get("/api/summary")
-def get_summary():
+def get_summary(request: Request, response: Response):
     """Get overall summary statistics."""
+    cached = _not_modified(
+        request, response,
+        _trade_version, len(TARGET_WALLETS), ws_manager.get_count() if ws_server else 0
+    )
+    if cached:
+        return cached
+
     summary = {
         "wallets": len(TARGET_WALLETS),
         "trades": len(trade_history),
@@ -595,6 +928,12 @@ def get_summary():
     return summary
 
 
+@functools.lru_cache(maxsize=4096)
+def _ts_isoformat(ts: int) -> str:
+    """ISO string for a unix timestamp (cached - per-market first/last rarely change)."""
+    return datetime.fromtimestamp(ts).isoformat()
+
+
 @app.get("/api/tracking-info")
 def get_tracking_info():
     """Get tracking session info including coverage per market."""
@@ -608,19 +947,13 @@ def get_tracking_info():
     if not trade_history:
         return info
 
-    # Group trades by market
-    market_trades = {}
-    for trade in trade_history:
-        slug = trade.market_slug
-        if slug not in market_trades:
-            market_trades[slug] = []
-        market_trades[slug].append(trade)
-
-    # Analyze each market
-    for slug, trades in market_trades.items():
-        trades_sorted = sorted(trades, key=lambda t: t.timestamp)
-        first_trade = trades_sorted[0]
-        last_trade = trades_sorted[-1]
+    # Analyze each market. This runs in the threadpool while the loop indexes
+    # and evicts trades, so iterate a snapshot and skip markets evicted since
+    for slug, trades in tuple(trades_by_market.items()):
+        first_trade = market_first_trade.get(slug)
+        last_trade = market_last_trade.get(slug)
+        if first_trade is None or last_trade is None:
+            continue
 
         # Get market context if available
         market_context = market_fetcher.cache.get(slug) if market_fetcher else None
@@ -629,8 +962,8 @@ def get_tracking_info():
             "slug": slug,
             "question": first_trade.market_question,
             "trades_captured": len(trades),
-            "first_trade_time": datetime.fromtimestamp(first_trade.timestamp).isoformat(),
-            "last_trade_time": datetime.fromtimestamp(last_trade.timestamp).isoformat(),
+            "first_trade_time": _ts_isoformat(first_trade.timestamp),
+            "last_trade_time": _ts_isoformat(last_trade.timestamp),
             "tracking_duration_mins": (last_trade.timestamp - first_trade.timestamp) / 60,
         }
 
@@ -707,12 +1040,19 @@ def get_config():
 @app.post("/api/config/wallet")
 def set_wallet(config: WalletConfig):
     """Update the tracked wallet."""
-    tracker_config["wallet_address"] = config.address.lower()
+    global _wallets_cache, _wallet_version
+    address = config.address.lower()
+    tracker_config["wallet_address"] = address
     tracker_config["wallet_name"] = config.name
 
-    # Update TARGET_WALLETS in config module
+    # Update TARGET_WALLETS in config module (in place, importers share it)
     TARGET_WALLETS.clear()
-    TARGET_WALLETS[config.address.lower()] = config.name
+    TARGET_WALLETS[address] = config.name
+    TARGET_WALLET_SET.clear()
+    TARGET_WALLET_SET.add(address)
+    _wallets_cache = None
+    _wallet_version += 1
+    _bump_version()
 
     return {"success": True, "wallet": config}
 
@@ -763,100 +1103,150 @@ def _get_traders_file() -> Path:
     return Path(__file__).parent / "db" / "top_traders.json"
 
 
+# Parsed traders list keyed by (path, mtime) so GETs skip the disk entirely
+# until the file actually changes
+_traders_cache: tuple = (None, 0.0, [])
+
+
 def _load_traders() -> list:
-    """Load traders from JSON file."""
+    """Load traders from JSON file (cached until the file's mtime changes)."""
+    global _traders_cache
     filepath = _get_traders_file()
-    if not filepath.exists():
+    try:
+        mtime = filepath.stat().st_mtime
+    except OSError:
         return []
+
+    cached_path, cached_mtime, cached = _traders_cache
+    if cached_path == filepath and cached_mtime == mtime:
+        return cached
+
     try:
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        raw = filepath.read_bytes()
+        traders = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
     except:
         return []
 
+    _traders_cache = (filepath, mtime, traders)
+    return traders
+
 
 def _save_traders(traders: list):
-    """Save traders to JSON file."""
+    """Save traders to JSON file atomically (write to .tmp, then rename)."""
+    global _traders_cache
     filepath = _get_traders_file()
     filepath.parent.mkdir(parents=True, exist_ok=True)
-    with open(filepath, 'w') as f:
-        json.dump(traders, f, indent=2)
+
+    if ORJSON_AVAILABLE:
+        data = orjson.dumps(traders, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(traders, indent=2).encode()
+
+    tmp = filepath.with_suffix(".json.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, filepath)
+
+    _traders_cache = (filepath, filepath.stat().st_mtime, traders)
+
+
+# Serializes read-modify-write of the traders file across concurrent requests
+_traders_lock = asyncio.Lock()
 
 
 @app.get("/api/traders")
-def get_traders():
+async def get_traders():
     """Get list of top traders."""
-    return _load_traders()
+    # Served from the in-memory cache; only a stat() unless the file changed.
+    # Even that touches the disk, so it runs in a worker thread
+    return json_response(await asyncio.to_thread(_load_traders))
 
 
 @app.post("/api/traders")
-def add_trader(trader: TopTrader):
+async def add_trader(trader: TopTrader):
     """Add a new top trader."""
-    traders = _load_traders()
-
-    # Check if wallet already exists
-    for t in traders:
-        if t["wallet"].lower() == trader.wallet.lower():
-            raise HTTPException(status_code=400, detail="Trader with this wallet already exists")
-
-    traders.append({
-        "name": trader.name,
-        "wallet": trader.wallet.lower(),
-        "link": trader.link,
-        "all_time_profit": trader.all_time_profit
-    })
+    async with _traders_lock:
+        # Copy so a failed save can't leave the cached list mutated
+        traders = list(await asyncio.to_thread(_load_traders))
+
+        # Check if wallet already exists
+        for t in traders:
+            if t["wallet"].lower() == trader.wallet.lower():
+                raise HTTPException(status_code=400, detail="Trader with this wallet already exists")
+
+        traders.append({
+            "name": trader.name,
+            "wallet": trader.wallet.lower(),
+            "link": trader.link,
+            "all_time_profit": trader.all_time_profit
+        })
 
-    # Sort by profit descending
-    traders.sort(key=lambda x: x["all_time_profit"], reverse=True)
-    _save_traders(traders)
+        # Sort by profit descending
+        traders.sort(key=lambda x: x["all_time_profit"], reverse=True)
+        await asyncio.to_thread(_save_traders, traders)
 
     return {"success": True, "trader": trader}
 
 
 @app.delete("/api/traders/{wallet}")
-def delete_trader(wallet: str):
+async def delete_trader(wallet: str):
     """Delete a trader by wallet address."""
-    traders = _load_traders()
-    original_count = len(traders)
-    traders = [t for t in traders if t["wallet"].lower() != wallet.lower()]
+    async with _traders_lock:
+        traders = await asyncio.to_thread(_load_traders)
+        original_count = len(traders)
+        traders = [t for t in traders if t["wallet"].lower() != wallet.lower()]
+
+        if len(traders) == original_count:
+            raise HTTPException(status_code=404, detail="Trader not found")
 
-    if len(traders) == original_count:
-        raise HTTPException(status_code=404, detail="Trader not found")
+        await asyncio.to_thread(_save_traders, traders)
 
-    _save_traders(traders)
     return {"success": True}
 
 
 @app.delete("/api/data/clear")
 def clear_all_data():
     """Clear all data from the database (creates backup first)."""
-    global trade_history
-
     if storage is None:
         raise HTTPException(status_code=500, detail="Storage not initialized")
 
     result = storage.clear_all()
 
     # Also clear in-memory trade history
-    trade_history = []
+    trade_history.clear()
+    trade_ids.clear()
+    trade_json.clear()
+    trades_by_wallet.clear()
+    trades_by_market.clear()
+    market_first_trade.clear()
+    market_last_trade.clear()
+    _bump_version()
 
     # Clear position tracker
     if position_tracker:
-        position_tracker.positions.clear()
+        position_tracker.clear()
 
     # Clear pattern detector
     if pattern_detector:
-        pattern_detector.trade_history.clear()
+        pattern_detector.clear()
 
     # Clear market context cache
     if market_fetcher:
-        market_fetcher.cache.clear()
+        market_fetcher.clear()
 
     return result
 
 
 # ===== Dashboard Static Files =====
 
+class ImmutableStaticFiles(StaticFiles):
+    """StaticFiles for content-hashed bundle files - safe to cache forever."""
+
+    def file_response(self, *args, **kwargs) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        return response
+
+
 # Mount static files for dashboard (if built)
 if _dashboard_available:
-    app.mount("/assets", StaticFiles(directory=_dashboard_dist / "assets"), name="assets")
+    app.mount("/assets", ImmutableStaticFiles(directory=_dashboard_dist / "assets"), name="assets")
@@ -1,6 +1,7 @@
 """Configuration constants for bot tracker."""
 
 import os
+import re
 
 # API Endpoints
 GAMMA_API = "https://gamma-api.polymarket.com"
@@ -13,15 +14,19 @@ POLYMARKET_DATA_API = "https://data-api.polymarket.com"
 # Polymarket WebSocket (for real-time market prices)
 POLYMARKET_WS_URL = "wss://ws-subscriptions-clob.polymarket.com/ws/market"
 
-# Target wallets to track
-TARGET_WALLETS = {
+# Target wallets to track (keys normalized to lowercase)
+TARGET_WALLETS = {k.lower(): v for k, v in {
     "0x6031b6eed1c97e853c6e0f03ad3ce3529351f96d": "gabagool22",
-}
+}.items()}
+# O(1) membership for normalized addresses; api.set_wallet updates this in
+# place alongside TARGET_WALLETS, so it is a set rather than a frozenset
+TARGET_WALLET_SET = set(TARGET_WALLETS)
 
 # Polling configuration
 TRADE_POLL_INTERVAL = 2  # seconds (faster for near real-time)
 MARKET_POLL_INTERVAL = 30  # seconds for market discovery
 REQUEST_TIMEOUT = 30  # seconds
+PRICE_FLUSH_INTERVAL = 0.1  # seconds between storing the latest price per market/outcome
 
 # Server configuration
 WEBSOCKET_HOST = os.getenv("WEBSOCKET_HOST", "0.0.0.0")
@@ -31,7 +36,13 @@ HTTP_PORT = int(os.getenv("PORT", os.getenv("HTTP_PORT", "8000")))  # Railway us
 
 # Markets to track (BTC and ETH Up/Down 15-minute markets)
 MARKET_SLUGS_PATTERN = r"(btc|eth)-updown-15m-\d+"
+MARKET_SLUGS_RE = re.compile(MARKET_SLUGS_PATTERN)
 MARKET_FILTER_ENABLED = True  # Only track BTC/ETH 15m markets
 
+
+def slug_matches(slug: str) -> bool:
+    """Check a market slug against the market filter (always True if disabled)."""
+    return not MARKET_FILTER_ENABLED or MARKET_SLUGS_RE.match(slug) is not None
+
 # Track only BUY trades (True) or all trades (False)
 BUY_ONLY = False  # Track ALL trades for accurate position calculation
@@ -41,9 +41,13 @@ export function useWebSocket(
           const message: WebSocketMessage = JSON.parse(event.data);
           setLastMessage(message);
 
-          const handler = handlers[message.type];
-          if (handler) {
-            handler(message.data);
+          // Server coalesces bursts into {type: 'batch', events: [...]}
+          const events = message.type === 'batch' ? message.events ?? [] : [message];
+          for (const evt of events) {
+            const handler = handlers[evt.type];
+            if (handler) {
+              handler(evt.data);
+            }
           }
         } catch (e) {
           console.error('Failed to parse WebSocket message:', e);
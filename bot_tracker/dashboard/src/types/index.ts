@@ -115,6 +115,7 @@ export interface WebSocketMessage {
   data: unknown;
   timestamp: string;
   sequence?: number;
+  events?: WebSocketMessage[];  // present when type === 'batch'
 }
 
 export interface Wallet {
@@ -0,0 +1,42 @@
+"""
+Logging for the bot tracker.
+Records are handed to a background thread so console writes never block the event loop.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+
+_listener = None
+
+
+def setup_logging(level: int = logging.INFO) -> logging.Logger:
+    """
+    Configure the "bot_tracker" logger once (safe to call repeatedly).
+
+    Log calls only enqueue the record; a QueueListener thread formats it
+    and writes it to stdout.
+
+    Returns:
+        The package logger; modules should use logging.getLogger(__name__)
+    """
+    global _listener
+
+    logger = logging.getLogger("bot_tracker")
+    if _listener is not None:
+        return logger
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+
+    _listener = logging.handlers.QueueListener(log_queue, console, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)  # Flush anything still queued on exit
+
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+    return logger
@@ -4,11 +4,12 @@ Orchestrates all components and runs the server.
 """
 
 import asyncio
-import re
+import logging
 import signal
-import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 try:
     import uvicorn
@@ -17,7 +18,13 @@ except ImportError:
     UVICORN_AVAILABLE = False
     print("Warning: uvicorn not installed. Run: pip install uvicorn")
 
-from .config import HTTP_HOST, HTTP_PORT, TARGET_WALLETS, MARKET_SLUGS_PATTERN, MARKET_FILTER_ENABLED
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+from .config import HTTP_HOST, HTTP_PORT, TARGET_WALLETS, PRICE_FLUSH_INTERVAL, slug_matches
 from .models import TradeEvent, MarketContext
 from .trade_poller import TradePoller
 from .market_context import MarketContextFetcher
@@ -25,15 +32,28 @@ from .position_tracker import PositionTracker
 from .pattern_detector import PatternDetector
 from .sqlite_storage import SQLiteStorage
 from .price_stream import PriceStream, PriceUpdate
-from .market_resolver import MarketResolver
+from .market_resolver import MarketResolver, COMPLETED_RETENTION_SECONDS
 from .market_discovery import MarketDiscovery
+from .logger import setup_logging
 from . import api
 
+# Named explicitly: under "python -m bot_tracker.main" __name__ is "__main__"
+logger = logging.getLogger("bot_tracker.main")
+
+# Upper bound (seconds) on the restart delay for a failing service
+SUPERVISOR_MAX_BACKOFF = 60
+
+# Startup listing of tracked wallets, formatted once at import
+_WALLET_BANNER = "\n".join(
+    f"  - {name}: {addr[:10]}...{addr[-6:]}" for addr, name in TARGET_WALLETS.items()
+)
+
 
 class BotTracker:
     """Main orchestrator for the bot trading tracker."""
 
     def __init__(self):
+        setup_logging()
         self.start_time = datetime.now()
 
         # Initialize components
@@ -43,13 +63,18 @@ class BotTracker:
         self.trade_poller = TradePoller(self.on_new_trades)
         self.storage = SQLiteStorage()  # SQLite database storage
         self.price_stream = PriceStream(
-            on_price_update=self.on_price_update
+            on_price_updates=self.on_price_updates
         )
 
         # New resolution-based components
         self.market_resolver = MarketResolver(
-            on_trades_fetched=self.on_market_resolved,
-            resolution_delay_seconds=120  # Wait 2 min after market ends
+            on_trades_fetched=self.on_resolved_trades,
+            resolution_delay_seconds=120,  # Wait 2 min after market ends
+            on_market_resolved=self.on_market_resolved
+        )
+        # Don't re-fetch markets already resolved before a restart
+        self.market_resolver.restore_completed(
+            self.storage.get_completed_markets(since=int(time.time()) - COMPLETED_RETENTION_SECONDS)
         )
         self.market_discovery = MarketDiscovery(self.market_fetcher)
 
@@ -67,8 +92,70 @@ class BotTracker:
         api.set_market_resolver(self.market_resolver)
 
         self.running = False
+        self.stopped = False
         self.price_update_count = 0
 
+        # Task running run(); cancelled on shutdown to unwind the TaskGroup
+        self._run_task: Optional[asyncio.Task] = None
+        self._http_server = None
+
+        # Storage writes are queued and flushed in batches by _writer_loop on a
+        # single dedicated thread, so file/DB I/O never blocks the event loop
+        # and writes stay ordered without sharing the default executor
+        self._write_q: asyncio.Queue = asyncio.Queue(maxsize=10_000)
+        self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="storage")
+
+        # Latest price tick per (market_slug, outcome); sampled into storage by
+        # _price_flush_loop so busy markets don't write every tick
+        self._latest_prices: Dict[Tuple[str, str], PriceUpdate] = {}
+
+        # Market context fetches in flight, by slug (see on_new_trades)
+        self._pending_market_fetches: Dict[str, asyncio.Task] = {}
+
+    def _queue_write(self, kind: str, payload):
+        """Queue a storage write (see SQLiteStorage.save_batch for kinds)."""
+        if kind in ("position", "market"):
+            # Positions and market contexts keep changing on the loop; snapshot
+            # them now so the storage thread never reads one mid-update
+            payload = payload.model_copy()
+        try:
+            self._write_q.put_nowait((kind, payload))
+        except asyncio.QueueFull:
+            # Writer is falling behind. Hand everything queued plus this write to
+            # the storage thread as one batch: batches the writer already took
+            # were submitted before it, so writes still land in order
+            batch = self._drain_write_queue()
+            batch.append((kind, payload))
+            self._io_pool.submit(self.storage.save_batch, batch)
+
+    def _drain_write_queue(self, max_items: int = None) -> list:
+        """Pop queued writes without waiting."""
+        batch = []
+        while not self._write_q.empty() and (max_items is None or len(batch) < max_items):
+            batch.append(self._write_q.get_nowait())
+        return batch
+
+    async def _writer_loop(self):
+        """Flush queued storage writes, one transaction per batch."""
+        while self.running:
+            batch = [await self._write_q.get()]
+            batch.extend(self._drain_write_queue(max_items=511))
+            try:
+                await asyncio.get_running_loop().run_in_executor(
+                    self._io_pool, self.storage.save_batch, batch
+                )
+            except Exception as e:
+                logger.error("Storage writer error: %s", e)
+
+    def _subscribe_prices(self, context: MarketContext):
+        """Subscribe the price stream to a market's Up/Down tokens."""
+        up_token = context.token_ids.get("up", "")
+        down_token = context.token_ids.get("down", "")
+        if up_token:
+            self.price_stream.add_asset(up_token, context.slug, "Up")
+        if down_token:
+            self.price_stream.add_asset(down_token, context.slug, "Down")
+
     async def _subscribe_to_existing_markets(self):
         """Subscribe to price stream for all 15-min markets with existing positions."""
         positions = self.position_tracker.get_all_positions()
@@ -78,47 +165,25 @@ class BotTracker:
         # Get unique market slugs, filtered to 15-min markets only
         market_slugs = set(
             p.market_slug for p in positions
-            if p.market_slug and (
-                not MARKET_FILTER_ENABLED or
-                re.match(MARKET_SLUGS_PATTERN, p.market_slug)
-            )
+            if p.market_slug and slug_matches(p.market_slug)
         )
-        print(f"Subscribing to prices for {len(market_slugs)} 15-min markets...")
+        logger.info("Subscribing to prices for %d 15-min markets...", len(market_slugs))
 
         for slug in market_slugs:
             try:
                 # Fetch market context to get token IDs
                 context = await self.market_fetcher.get_or_fetch_context(slug=slug)
                 if context:
-                    up_token = context.token_ids.get("up", "")
-                    down_token = context.token_ids.get("down", "")
-                    if up_token:
-                        self.price_stream.add_asset(up_token, context.slug, "Up")
-                    if down_token:
-                        self.price_stream.add_asset(down_token, context.slug, "Down")
-                    print(f"  Subscribed: {slug}")
+                    self._subscribe_prices(context)
+                    logger.info("  Subscribed: %s", slug)
             except Exception as e:
-                print(f"  Failed to subscribe to {slug}: {e}")
+                logger.error("  Failed to subscribe to %s: %s", slug, e)
 
-    async def on_market_resolved(self, market_slug: str, trades: List[TradeEvent], winning_outcome: str):
-        """Handle complete trade data for a resolved market."""
-        print(f"\n{'=' * 50}")
-        print(f"MARKET RESOLVED: {market_slug}")
-        print(f"Winner: {winning_outcome or 'Unknown'}")
-        print(f"Total trades: {len(trades)}")
-        print(f"{'=' * 50}")
-
-        if not trades:
-            return
-
-        # Process all trades for this market
+    async def on_resolved_trades(self, market_slug: str, trades: List[TradeEvent]):
+        """Handle all trades of a resolved market, oldest first."""
         for trade in trades:
             # Save trade
-            self.storage.save_trade(trade)
-
-            # Update position
-            position = self.position_tracker.update_position(trade)
-            self.storage.save_position(position)
+            self._queue_write("trade", trade)
 
             # Record for patterns
             self.pattern_detector.record_trade(trade)
@@ -126,54 +191,67 @@ class BotTracker:
             # Add to API history
             api.add_trade_to_history(trade)
 
+        # Update positions; nothing reads them mid-batch, so derived metrics
+        # are recalculated once per position rather than per trade
+        for position in self.position_tracker.update_positions(trades):
+            self._queue_write("position", position)
+
+    async def on_market_resolved(self, market_slug: str, total_trades: int, winning_outcome: Optional[str]):
+        """Handle a resolved market once all its trades were delivered."""
+        logger.info("\n%s", "=" * 50)
+        logger.info("MARKET RESOLVED: %s", market_slug)
+        logger.info("Winner: %s", winning_outcome or "Unknown")
+        logger.info("Total trades: %d", total_trades)
+        logger.info("%s", "=" * 50)
+
+        self._queue_write("completed", (market_slug, int(time.time()), total_trades))
+
+        if not total_trades:
+            return
+
         # Save market resolution info
         context = self.market_fetcher.cache.get(market_slug)
         if context:
             context.resolved = True
             context.winning_outcome = winning_outcome
-            self.storage.save_market(context)
+            self._queue_write("market", context)
 
         # Broadcast update
         try:
             await api.broadcast_to_websocket("market_resolved", {
                 "market_slug": market_slug,
                 "winning_outcome": winning_outcome,
-                "total_trades": len(trades)
+                "total_trades": total_trades
             })
         except Exception as e:
-            print(f"Broadcast error: {e}")
+            logger.error("Broadcast error: %s", e)
 
-        print(f"Processed {len(trades)} trades for {market_slug}\n")
+        logger.info("Processed %d trades for %s\n", total_trades, market_slug)
 
     async def _discover_and_track_markets(self):
         """Discover markets and add them to the resolver."""
         # First, discover recently resolved markets (catch up from offline)
-        print("Discovering recently resolved markets...")
+        logger.info("Discovering recently resolved markets...")
         resolved = await self.market_discovery.discover_recent_resolved(hours_back=24)
         for ctx in resolved:
             self.market_resolver.add_market_from_context(ctx)
             self.market_fetcher.cache[ctx.slug] = ctx
-            self.storage.save_market(ctx)
+            self._queue_write("market", ctx)
 
         # Discover active markets and subscribe to prices
-        print("Discovering active markets...")
+        logger.info("Discovering active markets...")
         active = await self.market_discovery.discover_markets()
         for ctx in active:
             self.market_resolver.add_market_from_context(ctx)
             self.market_fetcher.cache[ctx.slug] = ctx
-            self.storage.save_market(ctx)
+            self._queue_write("market", ctx)
 
             # Subscribe to price stream for active (non-closed) markets
             if not ctx.resolved:
-                up_token = ctx.token_ids.get("up", "")
-                down_token = ctx.token_ids.get("down", "")
-                if up_token:
-                    self.price_stream.add_asset(up_token, ctx.slug, "Up")
-                if down_token:
-                    self.price_stream.add_asset(down_token, ctx.slug, "Down")
+                self._subscribe_prices(ctx)
 
-        print(f"Tracking {self.market_resolver.get_pending_count()} markets for resolution")
-        print(f"Subscribed to {len(active)} markets for price updates")
+        logger.info("Tracking %d markets for resolution", self.market_resolver.get_pending_count())
+        logger.info("Subscribed to %d markets for price updates", len(active))
 
     async def _cleanup_loop(self):
         """Periodically cleanup old data to prevent memory leaks."""
@@ -196,13 +274,16 @@ class BotTracker:
                 self.market_discovery.cleanup_old_slugs(hours_back=24)
 
                 # Log memory stats
-                print(f"[Cleanup] Active: {len(self.market_fetcher.cache)} markets, "
-                      f"{len(self.price_stream.subscribed_assets)} price assets, "
-                      f"{self.market_resolver.get_pending_count()} pending, "
-                      f"{self.market_resolver.get_completed_count()} completed")
+                logger.info(
+                    "[Cleanup] Active: %d markets, %d price assets, %d pending, %d completed",
+                    len(self.market_fetcher.cache),
+                    len(self.price_stream.subscribed_assets),
+                    self.market_resolver.get_pending_count(),
+                    self.market_resolver.get_completed_count()
+                )
 
             except Exception as e:
-                print(f"[Cleanup] Error: {e}")
+                logger.error("[Cleanup] Error: %s", e)
 
     async def _discovery_loop(self):
         """Continuously discover new markets and add to resolver."""
@@ -212,104 +293,135 @@ class BotTracker:
                 for ctx in new_markets:
                     self.market_resolver.add_market_from_context(ctx)
                     self.market_fetcher.cache[ctx.slug] = ctx
-                    self.storage.save_market(ctx)
+                    self._queue_write("market", ctx)
 
                     # Only subscribe to prices for ACTIVE (non-resolved) markets
                     if not ctx.resolved:
-                        up_token = ctx.token_ids.get("up", "")
-                        down_token = ctx.token_ids.get("down", "")
-                        if up_token:
-                            self.price_stream.add_asset(up_token, ctx.slug, "Up")
-                        if down_token:
-                            self.price_stream.add_asset(down_token, ctx.slug, "Down")
+                        self._subscribe_prices(ctx)
 
             except Exception as e:
-                print(f"Discovery error: {e}")
+                logger.error("Discovery error: %s", e)
 
             await asyncio.sleep(30)  # Check every 30 seconds
 
-    async def on_price_update(self, update: PriceUpdate):
-        """Handle price update from WebSocket - save to storage."""
-        try:
-            self.storage.save_price_update(
-                market_slug=update.market_slug,
-                outcome=update.outcome,
-                price=update.price,
-                best_bid=update.best_bid,
-                best_ask=update.best_ask,
-                timestamp=update.timestamp
-            )
-            self.price_update_count += 1
+    async def on_price_updates(self, updates: List[PriceUpdate]):
+        """Handle one WebSocket message's price updates - buffer the latest per market/outcome."""
+        latest = self._latest_prices
+        for update in updates:
+            latest[(update.market_slug, update.outcome)] = update
+
+        # Log periodically
+        before = self.price_update_count
+        self.price_update_count += len(updates)
+        if self.price_update_count // 100 > before // 100:
+            logger.info("Price updates received: %d", self.price_update_count)
+
+    def _flush_latest_prices(self):
+        """Queue the newest buffered price per market/outcome for storage."""
+        if not self._latest_prices:
+            return
+        latest, self._latest_prices = self._latest_prices, {}
+        for update in latest.values():
+            self._queue_write("price", {
+                "market_slug": update.market_slug,
+                "outcome": update.outcome,
+                "price": update.price,
+                "best_bid": update.best_bid,
+                "best_ask": update.best_ask,
+                "timestamp": update.timestamp
+            })
 
-            # Log periodically
-            if self.price_update_count % 100 == 0:
-                print(f"Price updates saved: {self.price_update_count}")
+    async def _price_flush_loop(self):
+        """Sample buffered prices into storage at PRICE_FLUSH_INTERVAL."""
+        while self.running:
+            await asyncio.sleep(PRICE_FLUSH_INTERVAL)
+            try:
+                self._flush_latest_prices()
+            except Exception as e:
+                logger.error("Error saving price updates: %s", e)
+
+    async def _fetch_and_subscribe(self, slug: str):
+        """Fetch context for a newly seen market, save it and subscribe to its prices."""
+        try:
+            context = await self.market_fetcher.get_or_fetch_context(slug=slug)
+            if context:
+                self._queue_write("market", context)  # Save market metadata
+                await api.broadcast_to_websocket("market", context)
+
+                # Subscribe to price stream for this market
+                self._subscribe_prices(context)
+                logger.info("Subscribed to price stream: %s", context.slug)
         except Exception as e:
-            print(f"Error saving price update: {e}")
+            logger.error("Error fetching market context for %s: %s", slug, e)
 
     async def on_new_trades(self, trades: List[TradeEvent]):
         """Handle new trades from the poller."""
+        # Resolve the per-trade calls once per batch rather than per trade
+        queue_write = self._queue_write
+        cache_get = self.market_fetcher.cache.get
+        pending_fetches = self._pending_market_fetches
+        update_position = self.position_tracker.update_position
+        detector = self.pattern_detector
+        add_to_history = api.add_trade_to_history
+        broadcast = api.broadcast_to_websocket
+        client_count = api.ws_manager.get_count
+
         for trade in trades:
             try:
-                # Save trade to JSON file
-                self.storage.save_trade(trade)
-
-                # Ensure we have market context
-                if trade.market_slug and trade.market_slug not in self.market_fetcher.cache:
-                    try:
-                        context = await self.market_fetcher.get_or_fetch_context(slug=trade.market_slug)
-                        if context:
-                            self.storage.save_market(context)  # Save market metadata
-                            await api.broadcast_to_websocket("market", context.model_dump())
-
-                            # Subscribe to price stream for this market
-                            up_token = context.token_ids.get("up", "")
-                            down_token = context.token_ids.get("down", "")
-                            if up_token:
-                                self.price_stream.add_asset(up_token, context.slug, "Up")
-                            if down_token:
-                                self.price_stream.add_asset(down_token, context.slug, "Down")
-                            print(f"Subscribed to price stream: {context.slug}")
-                    except Exception as e:
-                        print(f"Error fetching market context for {trade.market_slug}: {e}")
+                # Save trade
+                queue_write("trade", trade)
+
+                # Fetch market context in the background so the trade isn't
+                # held up by the HTTP round trip
+                slug = trade.market_slug
+                market = cache_get(slug)
+                if slug and market is None and slug not in pending_fetches:
+                    task = asyncio.create_task(self._fetch_and_subscribe(slug))
+                    pending_fetches[slug] = task
+                    task.add_done_callback(lambda _, slug=slug: pending_fetches.pop(slug, None))
 
                 # Update position
-                position = self.position_tracker.update_position(trade)
+                position = update_position(trade)
 
                 # Save position snapshot
-                self.storage.save_position(position)
+                queue_write("position", position)
 
                 # Record for pattern detection
-                self.pattern_detector.record_trade(trade)
+                detector.record_trade(trade)
 
                 # Add to API trade history
-                api.add_trade_to_history(trade)
+                add_to_history(trade)
 
-                # Broadcast via WebSocket (using FastAPI WebSocket)
+                # Broadcast via WebSocket. These only encode and queue the
+                # event (run_broadcast_flusher does the sending), so plain
+                # awaits in turn are cheapest
                 try:
-                    await api.broadcast_to_websocket("trade", trade.model_dump())
-                    await api.broadcast_to_websocket("position", position.model_dump())
+                    await broadcast("trade", trade)
+                    await broadcast("position", position)
                 except Exception as e:
-                    print(f"WebSocket broadcast error: {e}")
+                    logger.error("WebSocket broadcast error: %s", e)
 
-                # Analyze and broadcast patterns
-                market = self.market_fetcher.cache.get(trade.market_slug)
-                timing = self.pattern_detector.analyze_timing(trade.wallet, trade.market_slug, market)
-                price = self.pattern_detector.analyze_price(trade.wallet, trade.market_slug)
-                hedge = self.pattern_detector.analyze_hedge(position)
+                # Patterns are only used for live updates (the API recomputes
+                # them on request), so skip the analysis with nobody connected.
+                # They run inline: each looks at <= 100 trades, which is cheaper
+                # than pickling that history over to a worker process
+                if client_count():
+                    timing = detector.analyze_timing(trade.wallet, trade.market_slug, market)
+                    price = detector.analyze_price(trade.wallet, trade.market_slug)
+                    hedge = detector.analyze_hedge(position)
 
-                try:
-                    if timing:
-                        await api.broadcast_to_websocket("timing", timing.model_dump())
-                    if price:
-                        await api.broadcast_to_websocket("price", price.model_dump())
-                    if hedge:
-                        await api.broadcast_to_websocket("hedge", hedge.model_dump())
-                except Exception as e:
-                    print(f"Pattern broadcast error: {e}")
+                    try:
+                        if timing:
+                            await broadcast("timing", timing)
+                        if price:
+                            await broadcast("price", price)
+                        if hedge:
+                            await broadcast("hedge", hedge)
+                    except Exception as e:
+                        logger.error("Pattern broadcast error: %s", e)
 
             except Exception as e:
-                print(f"Error processing trade {trade.id}: {e}")
+                logger.error("Error processing trade %s: %s", trade.id, e)
 
         # Broadcast updated stats
         try:
@@ -317,50 +429,40 @@ class BotTracker:
             stats["connected_clients"] = api.ws_manager.get_count()
             await api.broadcast_to_websocket("stats", stats)
         except Exception as e:
-            print(f"Stats broadcast error: {e}")
+            logger.error("Stats broadcast error: %s", e)
 
     async def run(self):
         """Start all services."""
         self.running = True
+        self._run_task = asyncio.current_task()
 
-        print("=" * 60)
-        print("BOT TRADING TRACKER (Resolution-Based)")
-        print("=" * 60)
-        print(f"Tracking {len(TARGET_WALLETS)} wallets:")
-        for addr, name in TARGET_WALLETS.items():
-            print(f"  - {name}: {addr[:10]}...{addr[-6:]}")
-        print()
-        print(f"Data saved to: {self.storage.db_dir}")
-        print()
-        print(f"HTTP API: http://{HTTP_HOST}:{HTTP_PORT}")
-        print(f"API Docs: http://{HTTP_HOST}:{HTTP_PORT}/docs")
-        print(f"WebSocket: ws://{HTTP_HOST}:{HTTP_PORT}/ws")
-        print()
-        print("Mode: Post-resolution trade capture (100% accuracy)")
-        print("=" * 60)
-        print()
-
-        # Discover markets and add to resolver
-        await self._discover_and_track_markets()
-
-        # Create tasks for all services
-        tasks = []
-
-        # Market discovery loop (finds new markets)
-        discovery_task = asyncio.create_task(self._discovery_loop())
-        tasks.append(discovery_task)
-
-        # Market resolver (fetches trades after markets end)
-        resolver_task = asyncio.create_task(self.market_resolver.run(check_interval=30))
-        tasks.append(resolver_task)
-
-        # Price stream (real-time prices from Polymarket)
-        price_task = asyncio.create_task(self.price_stream.run())
-        tasks.append(price_task)
-
-        # Cleanup loop (prevents memory leaks)
-        cleanup_task = asyncio.create_task(self._cleanup_loop())
-        tasks.append(cleanup_task)
+        # Shut down from the event loop rather than a signal frame, so no
+        # in-flight await is interrupted (not supported on Windows, where
+        # Ctrl+C surfaces as KeyboardInterrupt in main() instead)
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self._request_shutdown)
+            except NotImplementedError:
+                pass
+
+        logger.info("\n".join([
+            "=" * 60,
+            "BOT TRADING TRACKER (Resolution-Based)",
+            "=" * 60,
+            f"Tracking {len(TARGET_WALLETS)} wallets:",
+            _WALLET_BANNER,
+            "",
+            f"Data saved to: {self.storage.db_dir}",
+            "",
+            f"HTTP API: http://{HTTP_HOST}:{HTTP_PORT}",
+            f"API Docs: http://{HTTP_HOST}:{HTTP_PORT}/docs",
+            f"WebSocket: ws://{HTTP_HOST}:{HTTP_PORT}/ws",
+            "",
+            "Mode: Post-resolution trade capture (100% accuracy)",
+            "=" * 60,
+            "",
+        ]))
 
         # HTTP server (uvicorn)
         if UVICORN_AVAILABLE:
@@ -368,83 +470,146 @@ class BotTracker:
                 api.app,
                 host=HTTP_HOST,
                 port=HTTP_PORT,
-                log_level="info"
+                log_level="info",
+                # Protocol-level keepalive; silent clients get closed
+                ws_ping_interval=20,
+                ws_ping_timeout=20
             )
-            server = uvicorn.Server(config)
-            http_task = asyncio.create_task(server.serve())
-            tasks.append(http_task)
         else:
-            print("HTTP server not started: uvicorn not installed")
+            logger.info("HTTP server not started: uvicorn not installed")
 
-        # Monitor tasks and restart if they fail
+        # A shutdown request cancels this task wherever it is awaiting; the
+        # finally block then flushes storage before run() returns
+        try:
+            # Discover markets and add to resolver
+            await self._discover_and_track_markets()
+
+            # Run every service under a supervisor that restarts it if it fails
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self._supervise("storage writer", self._writer_loop))
+                tg.create_task(self._supervise("price sampler", self._price_flush_loop))
+                tg.create_task(self._supervise("market discovery", self._discovery_loop))
+                tg.create_task(self._supervise(
+                    "market resolver", lambda: self.market_resolver.run(check_interval=30)
+                ))
+                tg.create_task(self._supervise("price stream", self.price_stream.run))
+                tg.create_task(self._supervise("cleanup", self._cleanup_loop))
+                if UVICORN_AVAILABLE:
+                    tg.create_task(self._supervise("HTTP server", lambda: self._serve_http(config)))
+                    tg.create_task(self._supervise("WebSocket broadcaster", api.run_broadcast_flusher))
+        except asyncio.CancelledError:
+            if self.running:
+                raise
+        finally:
+            await self.async_stop()
+
+    async def _serve_http(self, config):
+        """Run uvicorn; once it has shut down for a stop request, unwind run()."""
+        self._http_server = uvicorn.Server(config)
+        try:
+            await self._http_server.serve()
+        finally:
+            self._http_server = None
+        if not self.running and self._run_task is not None:
+            self._run_task.cancel()
+
+    async def _supervise(self, name: str, factory):
+        """Run a service coroutine, restarting it with exponential backoff until stopped."""
+        loop = asyncio.get_running_loop()
+        failures = 0
         while self.running:
+            started = loop.time()
             try:
-                # Wait for any task to complete
-                done, pending = await asyncio.wait(
-                    tasks,
-                    return_when=asyncio.FIRST_COMPLETED,
-                    timeout=60  # Check every minute
-                )
-
-                # Check for failed tasks
-                for task in done:
-                    task_name = task.get_name() if hasattr(task, 'get_name') else str(task)
-                    try:
-                        exc = task.exception()
-                        if exc:
-                            print(f"Task failed with error: {exc}")
-                            print(f"Task: {task_name}")
-                    except asyncio.CancelledError:
-                        print(f"Task was cancelled: {task_name}")
-
-                # Update tasks list to only include pending
-                tasks = list(pending)
-
-                # If all tasks are done, exit
-                if not tasks:
-                    print("All tasks completed, exiting...")
-                    break
-
-            except asyncio.CancelledError:
-                print("Shutting down...")
-                break
+                await factory()
+                if not self.running:
+                    return
+                logger.error("Service '%s' exited unexpectedly", name)
             except Exception as e:
-                print(f"Error in task monitor: {e}")
-                await asyncio.sleep(5)  # Brief pause before retrying
+                logger.error("Service '%s' failed: %s", name, e)
 
-    def stop(self):
-        """Stop all services."""
+            # A service that stayed up for a while starts backing off from scratch
+            if loop.time() - started > SUPERVISOR_MAX_BACKOFF:
+                failures = 0
+            delay = min(2 ** failures, SUPERVISOR_MAX_BACKOFF)
+            failures += 1
+            logger.info("Restarting '%s' in %ds", name, delay)
+            await asyncio.sleep(delay)
+
+    def _stop_services(self):
         self.running = False
         self.market_resolver.stop()
         self.market_fetcher.stop()
         self.price_stream.stop()
 
-        # Save final data
+    def _request_shutdown(self):
+        """Signal handler: stop services and unwind run() so async_stop() can flush."""
+        if not self.running:
+            return
+        logger.info("\nReceived shutdown signal...")
+        self._stop_services()
+        if self._http_server is not None:
+            # Let uvicorn close its connections first; _serve_http cancels run()
+            self._http_server.should_exit = True
+        elif self._run_task is not None:
+            self._run_task.cancel()
+
+    async def async_stop(self):
+        """Stop all services, awaiting the final storage writes on the storage thread."""
+        if self.stopped:
+            return
+        self.stopped = True
+        self._stop_services()
+        await self.market_fetcher.close()
+
+        # Write anything still buffered or queued, then save final data
+        loop = asyncio.get_running_loop()
+        self._flush_latest_prices()
+        pending_writes = self._drain_write_queue()
+        if pending_writes:
+            await loop.run_in_executor(self._io_pool, self.storage.save_batch, pending_writes)
+        await loop.run_in_executor(self._io_pool, self.storage.flush)
+        self._io_pool.shutdown(wait=True)
+        self._log_session_summary()
+
+    def stop(self):
+        """Stop all services (for callers without a running event loop)."""
+        if self.stopped:
+            return
+        self.stopped = True
+        self._stop_services()
+
+        # Write anything still buffered or queued, then save final data
+        self._flush_latest_prices()
+        pending_writes = self._drain_write_queue()
+        if pending_writes:
+            self._io_pool.submit(self.storage.save_batch, pending_writes)
+        self._io_pool.shutdown(wait=True)
         self.storage.flush()
+        self._log_session_summary()
+
+    def _log_session_summary(self):
         summary = self.storage.get_session_summary()
-        print(f"\nSession saved: {summary['session_trades_count']} trades, {summary['total_positions_count']} positions")
-        print(f"Resolved markets: {self.market_resolver.get_completed_count()}")
-        print(f"Data location: {summary['db_dir']}")
+        logger.info(
+            "\nSession saved: %d trades, %d positions",
+            summary["session_trades_count"], summary["total_positions_count"]
+        )
+        logger.info("Resolved markets: %d", self.market_resolver.get_completed_count())
+        logger.info("Data location: %s", summary["db_dir"])
 
 
 def main():
     """Entry point."""
     tracker = BotTracker()
 
-    # Handle shutdown signals
-    def signal_handler(sig, frame):
-        print("\nReceived shutdown signal...")
-        tracker.stop()
-        sys.exit(0)
-
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # Use uvloop's libuv-based event loop if installed (API, WebSocket and pollers all share it)
+    if UVLOOP_AVAILABLE:
+        uvloop.install()
 
     # Run the tracker
     try:
         asyncio.run(tracker.run())
     except KeyboardInterrupt:
-        print("\nShutting down...")
+        logger.info("\nShutting down...")
         tracker.stop()
 
 
@@ -4,17 +4,68 @@ Market context fetcher - gets orderbook and metadata for active markets.
 
 import asyncio
 import aiohttp
+import functools
 import json
+import logging
 import re
-from typing import Dict, Optional, List
+import time
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timezone
+from dataclasses import dataclass
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from .config import GAMMA_API, CLOB_API, REQUEST_TIMEOUT, MARKET_POLL_INTERVAL
 from .models import MarketContext
 
+logger = logging.getLogger(__name__)
+
+
+FIFTEEN_MINUTES = 900  # Seconds
+
+# Max market refreshes in flight at once (shares the session's connection pool)
+REFRESH_CONCURRENCY = 16
+
+# Fallbacks for ISO strings datetime.fromisoformat rejects
+_FRACTION_TZ_RE = re.compile(r'(.+\.)(\d+)(\+.+)')  # Over-long fractional seconds
+_FRACTION_RE = re.compile(r'\.\d+')
+
+
+def _loads(raw):
+    """Parse JSON text or bytes (orjson if available)."""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _ts_from_slug(slug: str) -> Optional[int]:
+    """Window start timestamp encoded in a 15-minute market slug (e.g. btc-updown-15m-{ts})."""
+    if "-15m-" not in slug:
+        return None
+    try:
+        return int(slug.rsplit("-", 1)[1])
+    except ValueError:
+        return None
+
 
+def _best_price(levels: list, pick) -> Optional[float]:
+    """
+    Best price of a sorted book side without scanning every level.
+
+    Book sides come back sorted by price, so the best level is at one end;
+    comparing both ends keeps this correct whichever direction the side is
+    sorted in.
+    """
+    if not levels:
+        return None
+    return pick(float(levels[0]["price"]), float(levels[-1]["price"]))
+
+
+@functools.lru_cache(maxsize=4096)
 def parse_iso_datetime(date_str: str) -> Optional[datetime]:
-    """Parse ISO datetime string robustly."""
+    """Parse ISO datetime string robustly (memoized: a market's dates never change)."""
     if not date_str:
         return None
 
@@ -27,7 +78,7 @@ def parse_iso_datetime(date_str: str) -> Optional[datetime]:
         pass
 
     # Handle varying microsecond precision
-    match = re.match(r'(.+\.)(\d+)(\+.+)', date_str)
+    match = _FRACTION_TZ_RE.match(date_str)
     if match:
         prefix, micros, suffix = match.groups()
         micros = micros[:6].ljust(6, '0')
@@ -38,19 +89,48 @@ def parse_iso_datetime(date_str: str) -> Optional[datetime]:
             pass
 
     # Fallback: strip fractional seconds
-    date_str = re.sub(r'\.\d+', '', date_str)
+    date_str = _FRACTION_RE.sub('', date_str)
     try:
         return datetime.fromisoformat(date_str)
     except ValueError:
         return None
 
 
+@dataclass(frozen=True)
+class _StaticFields:
+    """Market metadata that never changes once a market is listed."""
+    token_ids: Dict[str, str]
+    outcomes: List[str]
+    outcome_keys: Tuple[str, ...]  # Lowercased outcomes
+    up_token: str
+    down_token: str
+    start_date: Optional[datetime]
+    end_date: Optional[datetime]  # Always timezone-aware
+
+
 class MarketContextFetcher:
     """Fetches and caches market metadata and orderbook data."""
 
     def __init__(self):
         self.cache: Dict[str, MarketContext] = {}
         self.running = False
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Parsed fixed metadata per conditionId (see _static_fields)
+        self._static_cache: Dict[str, _StaticFields] = {}
+
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session (created on first use), so connections and DNS are reused."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300, keepalive_timeout=60)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
 
     async def fetch_market_by_slug(
         self,
@@ -65,11 +145,11 @@ class MarketContextFetcher:
                 timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
             ) as resp:
                 if resp.status == 200:
-                    markets = await resp.json()
+                    markets = _loads(await resp.read())
                     if markets:
                         return markets[0] if isinstance(markets, list) else markets
         except Exception as e:
-            print(f"Error fetching market {slug}: {e}")
+            logger.error("Error fetching market %s: %s", slug, e)
         return None
 
     async def fetch_market_by_token(
@@ -85,11 +165,11 @@ class MarketContextFetcher:
                 timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
             ) as resp:
                 if resp.status == 200:
-                    markets = await resp.json()
+                    markets = _loads(await resp.read())
                     if markets:
                         return markets[0] if isinstance(markets, list) else markets
         except Exception as e:
-            print(f"Error fetching market for token {token_id[:20]}...: {e}")
+            logger.error("Error fetching market for token %.20s...: %s", token_id, e)
         return None
 
     async def fetch_orderbook(
@@ -97,7 +177,11 @@ class MarketContextFetcher:
         session: aiohttp.ClientSession,
         token_id: str
     ) -> dict:
-        """Fetch live orderbook from CLOB API."""
+        """Fetch live orderbook from CLOB API.
+
+        Books are only read when a market's context is built (about once per
+        market), so the whole payload is parsed rather than walked lazily.
+        """
         try:
             async with session.get(
                 f"{CLOB_API}/book",
@@ -105,37 +189,73 @@ class MarketContextFetcher:
                 timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
             ) as resp:
                 if resp.status == 200:
-                    return await resp.json()
+                    return _loads(await resp.read())
         except Exception as e:
-            print(f"Error fetching orderbook for {token_id[:20]}...: {e}")
+            logger.error("Error fetching orderbook for %.20s...: %s", token_id, e)
         return {"bids": [], "asks": []}
 
-    async def build_context(
-        self,
-        session: aiohttp.ClientSession,
-        market: dict
-    ) -> MarketContext:
-        """Build full market context with orderbook data."""
+    def _static_fields(self, market: dict) -> _StaticFields:
+        """Parse a market's fixed metadata (tokens, outcomes, dates) once per conditionId."""
+        condition_id = market.get("conditionId", "")
+        static = self._static_cache.get(condition_id) if condition_id else None
+        if static is not None:
+            return static
+
         # Parse token IDs and outcomes
         clob_tokens = market.get("clobTokenIds", "[]")
         outcomes = market.get("outcomes", "[]")
 
         if isinstance(clob_tokens, str):
-            clob_tokens = json.loads(clob_tokens)
+            clob_tokens = _loads(clob_tokens)
         if isinstance(outcomes, str):
-            outcomes = json.loads(outcomes)
+            outcomes = _loads(outcomes)
 
         # Map outcomes to tokens (lowercase keys)
+        outcome_keys = tuple(outcome.lower() for outcome in outcomes)
         token_ids = {}
-        for i, outcome in enumerate(outcomes):
+        for i, key in enumerate(outcome_keys):
             if i < len(clob_tokens):
-                token_ids[outcome.lower()] = clob_tokens[i]
+                token_ids[key] = clob_tokens[i]
 
-        # Determine up/down tokens
-        up_token = token_ids.get("up", clob_tokens[0] if clob_tokens else "")
-        down_token = token_ids.get("down", clob_tokens[1] if len(clob_tokens) > 1 else "")
+        # Parse dates. A 15-minute market ends 15 minutes after the window
+        # start in its slug; startDate is the listing time, so it is parsed
+        start_date = parse_iso_datetime(market.get("startDate", ""))
+        window_start = _ts_from_slug(market.get("slug", ""))
+        if window_start is not None:
+            end_date = datetime.fromtimestamp(window_start + FIFTEEN_MINUTES, tz=timezone.utc)
+        else:
+            end_date = parse_iso_datetime(market.get("endDate", ""))
+            if end_date and end_date.tzinfo is None:
+                end_date = end_date.replace(tzinfo=timezone.utc)
+
+        static = _StaticFields(
+            token_ids=token_ids,
+            outcomes=outcomes,
+            outcome_keys=outcome_keys,
+            # Determine up/down tokens
+            up_token=token_ids.get("up", clob_tokens[0] if clob_tokens else ""),
+            down_token=token_ids.get("down", clob_tokens[1] if len(clob_tokens) > 1 else ""),
+            start_date=start_date,
+            end_date=end_date,
+        )
+        if condition_id:
+            self._static_cache[condition_id] = static
+        return static
+
+    async def build_context(
+        self,
+        session: aiohttp.ClientSession,
+        market: dict,
+        now_ts: Optional[float] = None
+    ) -> MarketContext:
+        """Build full market context with orderbook data.
+
+        now_ts lets a caller building many contexts share one clock reading.
+        """
+        static = self._static_fields(market)
 
         # Fetch orderbooks concurrently
+        up_token, down_token = static.up_token, static.down_token
         up_book, down_book = await asyncio.gather(
             self.fetch_orderbook(session, up_token) if up_token else asyncio.sleep(0, {}),
             self.fetch_orderbook(session, down_token) if down_token else asyncio.sleep(0, {})
@@ -148,10 +268,10 @@ class MarketContextFetcher:
         down_bids = down_book.get("bids", []) if isinstance(down_book, dict) else []
         down_asks = down_book.get("asks", []) if isinstance(down_book, dict) else []
 
-        up_best_bid = max((float(b["price"]) for b in up_bids), default=None)
-        up_best_ask = min((float(a["price"]) for a in up_asks), default=None)
-        down_best_bid = max((float(b["price"]) for b in down_bids), default=None)
-        down_best_ask = min((float(a["price"]) for a in down_asks), default=None)
+        up_best_bid = _best_price(up_bids, max)
+        up_best_ask = _best_price(up_asks, min)
+        down_best_bid = _best_price(down_bids, max)
+        down_best_ask = _best_price(down_asks, min)
 
         combined_bid = None
         spread = None
@@ -159,35 +279,31 @@ class MarketContextFetcher:
             combined_bid = up_best_bid + down_best_bid
             spread = 1.0 - combined_bid
 
-        # Parse dates
-        start_date = parse_iso_datetime(market.get("startDate", ""))
-        end_date = parse_iso_datetime(market.get("endDate", ""))
-
+        end_date = static.end_date
         time_to_resolution = 0
         if end_date:
-            now = datetime.now(timezone.utc)
-            if end_date.tzinfo is None:
-                end_date = end_date.replace(tzinfo=timezone.utc)
-            time_to_resolution = max(0, (end_date - now).total_seconds() / 60)
+            if now_ts is None:
+                now_ts = time.time()
+            time_to_resolution = max(0, (end_date.timestamp() - now_ts) / 60)
 
         # Determine winning outcome
         winning_outcome = None
         outcome_prices = market.get("outcomePrices")
         if outcome_prices and market.get("closed"):
             if isinstance(outcome_prices, str):
-                outcome_prices = json.loads(outcome_prices)
+                outcome_prices = _loads(outcome_prices)
             for i, price in enumerate(outcome_prices):
-                if float(price) == 1.0 and i < len(outcomes):
-                    winning_outcome = outcomes[i].lower()
+                if float(price) == 1.0 and i < len(static.outcome_keys):
+                    winning_outcome = static.outcome_keys[i]
                     break
 
         return MarketContext(
             slug=market.get("slug", ""),
             question=market.get("question", ""),
             condition_id=market.get("conditionId", ""),
-            token_ids=token_ids,
-            outcomes=outcomes,
-            start_date=start_date,
+            token_ids=static.token_ids,
+            outcomes=static.outcomes,
+            start_date=static.start_date,
             end_date=end_date,
             time_to_resolution_mins=time_to_resolution,
             resolved=market.get("closed", False),
@@ -210,56 +326,69 @@ class MarketContextFetcher:
         if slug and slug in self.cache:
             return self.cache[slug]
 
-        async with aiohttp.ClientSession() as session:
-            market = None
+        session = await self.get_session()
+        market = None
 
-            if slug:
-                market = await self.fetch_market_by_slug(session, slug)
-            elif token_id:
-                market = await self.fetch_market_by_token(session, token_id)
+        if slug:
+            market = await self.fetch_market_by_slug(session, slug)
+        elif token_id:
+            market = await self.fetch_market_by_token(session, token_id)
 
-            if market:
-                context = await self.build_context(session, market)
-                self.cache[context.slug] = context
-                return context
+        if market:
+            context = await self.build_context(session, market)
+            self.cache[context.slug] = context
+            return context
 
         return None
 
-    async def refresh_context(self, slug: str) -> Optional[MarketContext]:
+    async def refresh_context(self, slug: str, now_ts: Optional[float] = None) -> Optional[MarketContext]:
         """Refresh orderbook data for a cached market."""
         if slug not in self.cache:
             return await self.get_or_fetch_context(slug=slug)
 
-        async with aiohttp.ClientSession() as session:
-            market = await self.fetch_market_by_slug(session, slug)
-            if market:
-                context = await self.build_context(session, market)
-                self.cache[slug] = context
-                return context
+        session = await self.get_session()
+        market = await self.fetch_market_by_slug(session, slug)
+        if market:
+            context = await self.build_context(session, market, now_ts)
+            self.cache[slug] = context
+            return context
 
         return None
 
     async def refresh_all(self) -> List[MarketContext]:
-        """Refresh all cached markets."""
+        """Refresh all cached markets concurrently (at most REFRESH_CONCURRENCY at a time)."""
+        slugs = tuple(self.cache)
+        semaphore = asyncio.Semaphore(REFRESH_CONCURRENCY)
+        now_ts = time.time()
+
+        async def refresh_one(slug: str) -> Optional[MarketContext]:
+            async with semaphore:
+                return await self.refresh_context(slug, now_ts)
+
+        results = await asyncio.gather(
+            *(refresh_one(slug) for slug in slugs),
+            return_exceptions=True
+        )
         refreshed = []
-        for slug in list(self.cache.keys()):
-            context = await self.refresh_context(slug)
-            if context:
-                refreshed.append(context)
+        for slug, result in zip(slugs, results):
+            if isinstance(result, Exception):
+                logger.error("Error refreshing market %s: %s", slug, result)
+            elif result:
+                refreshed.append(result)
         return refreshed
 
     async def run(self):
         """Periodically refresh orderbook data for active markets."""
         self.running = True
-        print(f"Market context fetcher started...")
+        logger.info("Market context fetcher started...")
 
         while self.running:
             try:
                 if self.cache:
                     await self.refresh_all()
-                    print(f"Refreshed {len(self.cache)} market contexts")
+                    logger.info("Refreshed %d market contexts", len(self.cache))
             except Exception as e:
-                print(f"Market refresh error: {e}")
+                logger.error("Market refresh error: %s", e)
 
             await asyncio.sleep(MARKET_POLL_INTERVAL)
 
@@ -271,6 +400,11 @@ class MarketContextFetcher:
         """Get all active (non-resolved) markets."""
         return [m for m in self.cache.values() if not m.resolved]
 
+    def clear(self):
+        """Drop all cached market contexts and parsed metadata."""
+        self.cache.clear()
+        self._static_cache.clear()
+
     def cleanup_old_markets(self, hours_back: int = 2) -> tuple:
         """Remove old resolved markets from cache to prevent memory bloat.
 
@@ -281,8 +415,8 @@ class MarketContextFetcher:
         removed_slugs = []
         removed_token_ids = []
 
-        for slug in list(self.cache.keys()):
-            ctx = self.cache.get(slug)
+        # Read-only pass over the cache; deletions happen afterwards
+        for slug, ctx in self.cache.items():
             if ctx and ctx.resolved and ctx.end_date:
                 # Make sure end_date is timezone-aware
                 end_date = ctx.end_date
@@ -290,14 +424,17 @@ class MarketContextFetcher:
                     end_date = end_date.replace(tzinfo=timezone.utc)
                 age_seconds = (now - end_date).total_seconds()
                 if age_seconds > cutoff_seconds:
-                    # Collect token IDs before removing
-                    for token_id in ctx.token_ids.values():
-                        if token_id:
-                            removed_token_ids.append(token_id)
-                    del self.cache[slug]
                     removed_slugs.append(slug)
 
+        for slug in removed_slugs:
+            ctx = self.cache.pop(slug)
+            self._static_cache.pop(ctx.condition_id, None)
+            # Collect token IDs of removed markets
+            for token_id in ctx.token_ids.values():
+                if token_id:
+                    removed_token_ids.append(token_id)
+
         if removed_slugs:
-            print(f"[MarketContext] Cleaned up {len(removed_slugs)} old markets from cache")
+            logger.info("[MarketContext] Cleaned up %d old markets from cache", len(removed_slugs))
 
         return removed_slugs, removed_token_ids
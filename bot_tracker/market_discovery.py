@@ -4,14 +4,23 @@ Market discovery - finds active/upcoming 15-minute BTC/ETH markets.
 
 import asyncio
 import aiohttp
-import re
+import logging
 import time
-from typing import List, Set, Optional
+from collections import OrderedDict
+from typing import Iterator, List, Optional
 from datetime import datetime, timezone
 
-from .config import GAMMA_API, REQUEST_TIMEOUT, MARKET_SLUGS_PATTERN
+from .config import GAMMA_API, REQUEST_TIMEOUT
 from .models import MarketContext
-from .market_context import MarketContextFetcher, parse_iso_datetime
+from .market_context import MarketContextFetcher, parse_iso_datetime, _loads
+
+logger = logging.getLogger(__name__)
+
+# Slug for each tracked asset's 15-minute market, formatted with the window start
+SLUG_TEMPLATES = ("btc-updown-15m-%d", "eth-updown-15m-%d")
+
+# Upper bound on remembered slugs (a day of backfill is ~200); oldest are evicted first
+MAX_DISCOVERED_SLUGS = 4096
 
 
 class MarketDiscovery:
@@ -24,8 +33,18 @@ class MarketDiscovery:
 
     def __init__(self, market_fetcher: MarketContextFetcher):
         self.market_fetcher = market_fetcher
-        self.discovered_slugs: Set[str] = set()
+        # Insertion-ordered slug set, bounded at MAX_DISCOVERED_SLUGS (see _mark_discovered)
+        self.discovered_slugs: OrderedDict[str, None] = OrderedDict()
         self.running = False
+        # (base_ts, lookback, lookahead) and the slugs last generated for it
+        self._slug_cache: Optional[tuple] = None
+
+    def _mark_discovered(self, slug: str):
+        """Remember a slug, evicting the least recently added past MAX_DISCOVERED_SLUGS."""
+        self.discovered_slugs[slug] = None
+        self.discovered_slugs.move_to_end(slug)
+        if len(self.discovered_slugs) > MAX_DISCOVERED_SLUGS:
+            self.discovered_slugs.popitem(last=False)
 
     def _generate_market_slugs(self, lookback_periods: int = 4, lookahead_periods: int = 2) -> List[str]:
         """Generate expected market slugs based on current time.
@@ -36,41 +55,53 @@ class MarketDiscovery:
         interval = 900  # 15 minutes in seconds
         base_ts = (now // interval) * interval
 
-        slugs = []
-        for asset in ["btc", "eth"]:
-            # Look back and ahead
-            for offset in range(-lookback_periods, lookahead_periods + 1):
-                ts = base_ts + (offset * interval)
-                slugs.append(f"{asset}-updown-15m-{ts}")
-
+        # The list only changes when a new 15-minute window starts
+        key = (base_ts, lookback_periods, lookahead_periods)
+        if self._slug_cache is not None and self._slug_cache[0] == key:
+            return self._slug_cache[1]
+
+        offsets = range(-lookback_periods, lookahead_periods + 1)  # Look back and ahead
+        slugs = [
+            template % (base_ts + offset * interval)
+            for template in SLUG_TEMPLATES
+            for offset in offsets
+        ]
+        self._slug_cache = (key, slugs)
         return slugs
 
+    def _iter_new_slugs(self, lookback_periods: int = 4, lookahead_periods: int = 2) -> Iterator[str]:
+        """Yield expected market slugs that have not been discovered yet."""
+        discovered = self.discovered_slugs
+        for slug in self._generate_market_slugs(lookback_periods, lookahead_periods):
+            if slug not in discovered:
+                yield slug
+
     async def discover_markets(self) -> List[MarketContext]:
         """Find all active/upcoming 15-min BTC/ETH markets."""
         new_markets = []
 
-        # Generate expected slugs based on current time
-        expected_slugs = self._generate_market_slugs()
-
-        async with aiohttp.ClientSession() as session:
-            for slug in expected_slugs:
-                # Skip if already discovered
-                if slug in self.discovered_slugs:
-                    continue
-
-                # Try to fetch this specific market
-                market = await self._fetch_market_by_slug(session, slug)
-                if not market:
-                    continue
+        # Look up every undiscovered slug at once rather than one GET at a time
+        candidates = list(self._iter_new_slugs())
+        if not candidates:
+            return new_markets
+        session = await self.market_fetcher.get_session()
+        markets = await asyncio.gather(
+            *(self._fetch_market_by_slug(session, slug) for slug in candidates)
+        )
+
+        now_ts = time.time()
+        for slug, market in zip(candidates, markets):
+            if not market:
+                continue
 
-                # Build full context
-                try:
-                    context = await self.market_fetcher.build_context(session, market)
-                    self.discovered_slugs.add(slug)
-                    new_markets.append(context)
-                    print(f"[Discovery] New market: {slug} (closed: {market.get('closed', False)})")
-                except Exception as e:
-                    print(f"[Discovery] Error building context for {slug}: {e}")
+            # Build full context
+            try:
+                context = await self.market_fetcher.build_context(session, market, now_ts)
+                self._mark_discovered(slug)
+                new_markets.append(context)
+                logger.info("[Discovery] New market: %s (closed: %s)", slug, market.get("closed", False))
+            except Exception as e:
+                logger.error("[Discovery] Error building context for %s: %s", slug, e)
 
         return new_markets
 
@@ -87,7 +118,7 @@ class MarketDiscovery:
                 timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
             ) as resp:
                 if resp.status == 200:
-                    markets = await resp.json()
+                    markets = _loads(await resp.read())
                     if markets:
                         return markets[0] if isinstance(markets, list) else markets
         except Exception as e:
@@ -105,53 +136,54 @@ class MarketDiscovery:
         periods_back = int((hours_back * 60) / 15)  # e.g., 24h = 96 periods
 
         # Generate slugs for past periods
-        now = int(time.time())
+        now_ts = time.time()
+        now = int(now_ts)
         interval = 900  # 15 minutes
         base_ts = (now // interval) * interval
 
-        async with aiohttp.ClientSession() as session:
-            for asset in ["btc", "eth"]:
-                for i in range(1, periods_back + 1):
-                    ts = base_ts - (i * interval)
-                    slug = f"{asset}-updown-15m-{ts}"
+        session = await self.market_fetcher.get_session()
+        for template in SLUG_TEMPLATES:
+            for i in range(1, periods_back + 1):
+                ts = base_ts - (i * interval)
+                slug = template % ts
 
-                    # Skip if already discovered
-                    if slug in self.discovered_slugs:
-                        continue
+                # Skip if already discovered
+                if slug in self.discovered_slugs:
+                    continue
 
-                    # Try to fetch this market
-                    market = await self._fetch_market_by_slug(session, slug)
-                    if not market:
-                        continue
+                # Try to fetch this market
+                market = await self._fetch_market_by_slug(session, slug)
+                if not market:
+                    continue
 
-                    # Only include closed markets
-                    if not market.get("closed", False):
-                        continue
+                # Only include closed markets
+                if not market.get("closed", False):
+                    continue
 
-                    try:
-                        context = await self.market_fetcher.build_context(session, market)
-                        self.discovered_slugs.add(slug)
-                        resolved_markets.append(context)
+                try:
+                    context = await self.market_fetcher.build_context(session, market, now_ts)
+                    self._mark_discovered(slug)
+                    resolved_markets.append(context)
 
-                        hours_ago = i * 0.25  # Each period is 15 min = 0.25 hours
-                        print(f"[Discovery] Recent resolved: {slug} ({hours_ago:.1f}h ago)")
-                    except Exception as e:
-                        print(f"[Discovery] Error building context for {slug}: {e}")
+                    hours_ago = i * 0.25  # Each period is 15 min = 0.25 hours
+                    logger.info("[Discovery] Recent resolved: %s (%.1fh ago)", slug, hours_ago)
+                except Exception as e:
+                    logger.error("[Discovery] Error building context for %s: %s", slug, e)
 
         return resolved_markets
 
     async def run(self, interval: int = 30):
         """Main loop - periodically discover new markets."""
         self.running = True
-        print(f"[Discovery] Started (interval: {interval}s)")
+        logger.info("[Discovery] Started (interval: %ss)", interval)
 
         while self.running:
             try:
                 new_markets = await self.discover_markets()
                 if new_markets:
-                    print(f"[Discovery] Found {len(new_markets)} new markets")
+                    logger.info("[Discovery] Found %d new markets", len(new_markets))
             except Exception as e:
-                print(f"[Discovery] Error: {e}")
+                logger.error("[Discovery] Error: %s", e)
 
             await asyncio.sleep(interval)
 
@@ -165,7 +197,7 @@ class MarketDiscovery:
 
     def mark_as_discovered(self, slug: str):
         """Mark a market as already discovered (e.g., from storage)."""
-        self.discovered_slugs.add(slug)
+        self._mark_discovered(slug)
 
     def cleanup_old_slugs(self, hours_back: int = 24):
         """Remove old slugs to prevent memory bloat (keep last 24h)."""
@@ -184,7 +216,7 @@ class MarketDiscovery:
                 continue
 
         for slug in old_slugs:
-            self.discovered_slugs.discard(slug)
+            self.discovered_slugs.pop(slug, None)
 
         if old_slugs:
-            print(f"[Discovery] Cleaned up {len(old_slugs)} old slugs")
+            logger.info("[Discovery] Cleaned up %d old slugs", len(old_slugs))
@@ -5,10 +5,14 @@ Guarantees 100% trade capture by querying after trading stops.
 
 import asyncio
 import aiohttp
+import contextlib
+import heapq
+import random
 import re
 from dataclasses import dataclass
-from typing import Dict, Set, List, Optional, Callable, Awaitable
+from typing import Dict, Set, List, Mapping, Optional, Callable, Awaitable, Tuple
 from datetime import datetime, timezone
+from urllib.parse import urlsplit
 import time
 
 from .config import (
@@ -16,9 +20,17 @@ from .config import (
     TARGET_WALLETS, MARKET_SLUGS_PATTERN
 )
 from .models import TradeEvent, MarketContext
+from .market_context import _loads
 
+TRADES_PAGE_SIZE = 500  # Data API /trades page limit
+MAX_CONCURRENT_REQUESTS = 16  # Per API host
+MAX_RETRIES = 5  # For 429 / 5xx responses
+UNRESOLVED_RETRY_SECONDS = 60
+MAX_RESOLUTION_WAIT_SECONDS = 3600  # Complete with an unknown winner after this long
+COMPLETED_RETENTION_SECONDS = 24 * 3600  # How long completed markets are remembered
 
-@dataclass
+
+@dataclass(slots=True)
 class PendingMarket:
     """Market waiting to be resolved."""
     slug: str
@@ -27,6 +39,56 @@ class PendingMarket:
     question: str = ""
 
 
+class HostRateLimiter:
+    """
+    Per-host request throttle.
+
+    Caps concurrent requests to each host, and when a response says the
+    quota is used up (429, or X-RateLimit-Remaining: 0) holds back further
+    requests to that host until the advertised reset time.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_REQUESTS):
+        self.max_concurrent = max_concurrent
+        self._slots: Dict[str, asyncio.Semaphore] = {}
+        self._resume_at: Dict[str, float] = {}  # host -> time.time() when requests may resume
+
+    @contextlib.asynccontextmanager
+    async def acquire(self, host: str):
+        """Hold one of the host's request slots, waiting out any active pause."""
+        slots = self._slots.get(host)
+        if slots is None:
+            slots = self._slots[host] = asyncio.Semaphore(self.max_concurrent)
+        async with slots:
+            delay = self._resume_at.get(host, 0) - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            yield
+
+    def update(self, host: str, resp: aiohttp.ClientResponse):
+        """Pause the host if the response reports the rate limit as exhausted."""
+        headers = resp.headers
+        if resp.status == 429:
+            delay = self._seconds(headers.get("Retry-After") or headers.get("X-RateLimit-Reset"))
+        elif headers.get("X-RateLimit-Remaining") == "0":
+            delay = self._seconds(headers.get("X-RateLimit-Reset"))
+        else:
+            return
+        if delay:
+            self._resume_at[host] = max(self._resume_at.get(host, 0), time.time() + delay)
+
+    @staticmethod
+    def _seconds(value: Optional[str]) -> Optional[float]:
+        """Seconds to wait from a reset header (delta seconds or a unix timestamp)."""
+        try:
+            seconds = float(value)
+        except (TypeError, ValueError):
+            return None
+        if seconds > 1e9:  # Absolute epoch time
+            seconds -= time.time()
+        return max(0.0, seconds)
+
+
 class MarketResolver:
     """
     Fetches complete trade data after markets resolve.
@@ -38,22 +100,80 @@ class MarketResolver:
 
     def __init__(
         self,
-        on_trades_fetched: Callable[[str, List[TradeEvent], Optional[str]], Awaitable[None]],
-        resolution_delay_seconds: int = 120  # Wait 2 min after market ends
+        on_trades_fetched: Callable[[str, List[TradeEvent]], Awaitable[None]],
+        resolution_delay_seconds: int = 120,  # Wait 2 min after market ends
+        on_market_resolved: Optional[Callable[[str, int, Optional[str]], Awaitable[None]]] = None
     ):
         """
         Args:
-            on_trades_fetched: Callback when trades are fetched for a market.
-                              Args: (market_slug, trades, winning_outcome)
+            on_trades_fetched: Callback with all of a market's trades, oldest first.
+                              Args: (market_slug, trades)
             resolution_delay_seconds: How long to wait after market ends before fetching
+            on_market_resolved: Callback once the market's trades were delivered.
+                               Args: (market_slug, total_trades, winning_outcome)
         """
         self.on_trades_fetched = on_trades_fetched
+        self.on_market_resolved = on_market_resolved
         self.resolution_delay = resolution_delay_seconds
 
         self.pending_markets: Dict[str, PendingMarket] = {}  # slug -> PendingMarket
         self.completed_markets: Set[str] = set()
         self._completion_times: Dict[str, int] = {}  # slug -> completion timestamp
         self.running = False
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Caps requests in flight per API host across all markets and wallets
+        self._limiter = HostRateLimiter()
+        # slug -> (fetched_at, winning outcome); a winner never changes once known,
+        # a missing one is re-fetched after UNRESOLVED_RETRY_SECONDS
+        self._resolution_cache: Dict[str, Tuple[float, Optional[str]]] = {}
+        # slug -> ETag of the last Gamma market document, so re-checks of a
+        # still-unresolved market can be answered with 304 Not Modified
+        self._etags: Dict[str, str] = {}
+        # slug -> trade count, for markets whose trades were delivered but whose
+        # winner wasn't published yet; only the resolution is re-checked for these
+        self._awaiting_winner: Dict[str, int] = {}
+        # Set when run() should re-evaluate its next wake-up (new market or stop)
+        self._wake = asyncio.Event()
+        # Min-heap of (resolution deadline, slug); stale entries are skipped lazily
+        self._deadlines: List[Tuple[int, str]] = []
+        self.retry_interval = 30  # Seconds before retrying a market whose fetch failed
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Shared HTTP session for the resolver's lifetime (created on first use)."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=64, limit_per_host=16, ttl_dns_cache=300)
+            )
+        return self._session
+
+    async def close(self):
+        """Close the shared HTTP session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        **kwargs
+    ) -> Tuple[int, Mapping[str, str], bytes]:
+        """GET through the host limiter, retrying 429/5xx with exponential backoff."""
+        host = urlsplit(url).hostname or url
+        attempt = 0
+        while True:
+            async with self._limiter.acquire(host):
+                async with session.get(
+                    url,
+                    timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+                    **kwargs
+                ) as resp:
+                    self._limiter.update(host, resp)
+                    retry = (resp.status == 429 or resp.status >= 500) and attempt < MAX_RETRIES
+                    if not retry:
+                        return resp.status, resp.headers, await resp.read()
+            await asyncio.sleep(2 ** attempt + random.random())
+            attempt += 1
 
     def add_market(self, slug: str, condition_id: str, end_timestamp: int, question: str = ""):
         """Register a market to fetch when it resolves."""
@@ -67,7 +187,16 @@ class MarketResolver:
                 end_timestamp=end_timestamp,
                 question=question
             )
+            heapq.heappush(self._deadlines, (end_timestamp + self.resolution_delay, slug))
             print(f"[Resolver] Tracking market: {slug} (ends at {datetime.fromtimestamp(end_timestamp)})")
+            self._wake.set()  # Reschedule run() in case this market is due sooner
+
+    def restore_completed(self, completed: Dict[str, int]):
+        """Mark markets completed in a previous run ({slug: completed_at}) so they aren't re-fetched."""
+        for slug, completed_at in completed.items():
+            self.completed_markets.add(slug)
+            self._completion_times[slug] = completed_at
+            self.pending_markets.pop(slug, None)
 
     def add_market_from_context(self, context: MarketContext):
         """Register a market from a MarketContext object."""
@@ -82,60 +211,78 @@ class MarketResolver:
             question=context.question
         )
 
-    async def _fetch_trades_for_market(
+    async def _fetch_wallet_page(
         self,
         session: aiohttp.ClientSession,
-        market: PendingMarket
+        condition_id: str,
+        wallet: str,
+        offset: int
+    ) -> list:
+        """Fetch one page of a wallet's trades in a market (raises if the page can't be fetched)."""
+        params = {
+            "conditionId": condition_id,
+            "user": wallet,
+            "limit": TRADES_PAGE_SIZE,
+            "offset": offset
+        }
+
+        # Errors propagate: a market with a missing page must not be completed
+        status, _, body = await self._get(session, f"{POLYMARKET_DATA_API}/trades", params=params)
+        if status != 200:
+            raise RuntimeError(f"trades page at offset {offset} for {wallet[:10]}... returned HTTP {status}")
+        return _loads(body)
+
+    async def _fetch_wallet_trades(
+        self,
+        session: aiohttp.ClientSession,
+        market: PendingMarket,
+        wallet: str,
+        wallet_name: str
     ) -> List[TradeEvent]:
-        """Fetch ALL trades for a resolved market using conditionId + user."""
-        all_trades = []
-
-        for wallet, wallet_name in TARGET_WALLETS.items():
-            offset = 0
-            wallet_trades = []
-
-            while True:
-                params = {
-                    "conditionId": market.condition_id,
-                    "user": wallet,
-                    "limit": 500,
-                    "offset": offset
-                }
-
-                try:
-                    async with session.get(
-                        f"{POLYMARKET_DATA_API}/trades",
-                        params=params,
-                        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
-                    ) as resp:
-                        if resp.status != 200:
-                            print(f"[Resolver] Error fetching trades: {resp.status}")
-                            break
-                        raw_trades = await resp.json()
-                except Exception as e:
-                    print(f"[Resolver] Error: {e}")
-                    break
+        """Page through all of one wallet's trades in a market."""
+        wallet_trades = []
+        offset = 0
 
-                if not raw_trades:
-                    break
+        while True:
+            raw_trades = await self._fetch_wallet_page(session, market.condition_id, wallet, offset)
+            if not raw_trades:
+                break
 
-                # Parse trades
-                for raw in raw_trades:
-                    trade = self._parse_trade(raw, wallet, wallet_name, market.slug)
-                    if trade:
-                        wallet_trades.append(trade)
+            # Parse trades
+            for raw in raw_trades:
+                trade = self._parse_trade(raw, wallet, wallet_name, market.slug)
+                if trade:
+                    wallet_trades.append(trade)
 
-                if len(raw_trades) < 500:
-                    break
-                offset += 500
+            if len(raw_trades) < TRADES_PAGE_SIZE:
+                break
+            offset += TRADES_PAGE_SIZE
 
-            if wallet_trades:
-                print(f"[Resolver] {market.slug}: {len(wallet_trades)} trades for {wallet_name}")
-                all_trades.extend(wallet_trades)
+        if wallet_trades:
+            print(f"[Resolver] {market.slug}: {len(wallet_trades)} trades for {wallet_name}")
+        return wallet_trades
 
-        # Sort by timestamp
+    async def _fetch_trades_for_market(
+        self,
+        session: aiohttp.ClientSession,
+        market: PendingMarket
+    ) -> int:
+        """Fetch ALL trades for a resolved market using conditionId + user (returns the count)."""
+        # Wallets are fetched concurrently; each wallet's pages follow one another
+        # since the next offset is only known once a page comes back full.
+        # Any failed page raises here, before a single trade is handed over
+        results = await asyncio.gather(*(
+            self._fetch_wallet_trades(session, market, wallet, wallet_name)
+            for wallet, wallet_name in TARGET_WALLETS.items()
+        ))
+        all_trades = [trade for wallet_trades in results for trade in wallet_trades]
+
+        # Positions, pattern history and the API trade history all expect
+        # trades oldest first, so hand them over in one sorted batch
         all_trades.sort(key=lambda t: t.timestamp)
-        return all_trades
+        if all_trades and self.on_trades_fetched:
+            await self.on_trades_fetched(market.slug, all_trades)
+        return len(all_trades)
 
     def _parse_trade(
         self,
@@ -145,34 +292,41 @@ class MarketResolver:
         market_slug: str
     ) -> Optional[TradeEvent]:
         """Parse raw trade data into TradeEvent."""
-        trade_id = f"{raw.get('transactionHash', '')}:{raw.get('asset', '')}"
+        # Fields may be present but null, so fall back with "or" rather than get() defaults
+        tx_hash = raw.get("transactionHash") or ""
+        trade_id = f"{tx_hash}:{raw.get('asset') or ''}"
 
         # Parse timestamp
         ts = raw.get("timestamp")
         if isinstance(ts, str):
             try:
-                dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                timestamp = int(dt.timestamp())
-            except:
+                if ts.endswith("Z"):
+                    ts = ts[:-1] + "+00:00"
+                timestamp = int(datetime.fromisoformat(ts).timestamp())
+            except ValueError:
                 timestamp = int(time.time())
         else:
             timestamp = int(ts) if ts else int(time.time())
 
-        return TradeEvent(
+        shares = float(raw.get("size") or 0)
+        price = float(raw.get("price") or 0)
+
+        # Data API fields are coerced here, so skip pydantic validation
+        return TradeEvent.model_construct(
             id=trade_id,
-            tx_hash=raw.get("transactionHash", ""),
+            tx_hash=tx_hash,
             timestamp=timestamp,
             wallet=wallet,
             wallet_name=wallet_name,
             role="taker",
-            side=raw.get("side", "BUY"),
-            outcome=raw.get("outcome", "Unknown"),
-            shares=float(raw.get("size", 0)),
-            usdc=float(raw.get("size", 0)) * float(raw.get("price", 0)),
-            price=float(raw.get("price", 0)),
-            fee=0,
+            side=raw.get("side") or "BUY",
+            outcome=raw.get("outcome") or "Unknown",
+            shares=shares,
+            usdc=shares * price,
+            price=price,
+            fee=0.0,
             market_slug=market_slug,
-            market_question=raw.get("title", "")
+            market_question=raw.get("title") or ""
         )
 
     async def _fetch_market_resolution(
@@ -180,31 +334,57 @@ class MarketResolver:
         session: aiohttp.ClientSession,
         market: PendingMarket
     ) -> Optional[str]:
-        """Fetch the winning outcome for a resolved market."""
+        """Fetch the winning outcome for a resolved market (memoized, see _resolution_cache)."""
+        cached = self._resolution_cache.get(market.slug)
+        if cached is not None:
+            fetched_at, outcome = cached
+            if outcome is not None or time.time() - fetched_at < UNRESOLVED_RETRY_SECONDS:
+                return outcome
+
+        outcome = await self._request_market_resolution(session, market)
+        self._resolution_cache[market.slug] = (time.time(), outcome)
+        if outcome is not None:
+            self._etags.pop(market.slug, None)  # Winner is final, no more re-checks
+        return outcome
+
+    async def _request_market_resolution(
+        self,
+        session: aiohttp.ClientSession,
+        market: PendingMarket
+    ) -> Optional[str]:
+        """Look up the winning outcome on the Gamma API (None if not resolved yet)."""
+        etag = self._etags.get(market.slug)
+        headers = {"If-None-Match": etag} if etag else None
         try:
-            async with session.get(
+            status, resp_headers, body = await self._get(
+                session,
                 f"{GAMMA_API}/markets",
                 params={"slug": market.slug},
-                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
-            ) as resp:
-                if resp.status == 200:
-                    markets = await resp.json()
-                    if markets:
-                        market_data = markets[0] if isinstance(markets, list) else markets
-                        if market_data.get("closed"):
-                            outcome_prices = market_data.get("outcomePrices", "[]")
-                            outcomes = market_data.get("outcomes", "[]")
-
-                            if isinstance(outcome_prices, str):
-                                import json
-                                outcome_prices = json.loads(outcome_prices)
-                            if isinstance(outcomes, str):
-                                import json
-                                outcomes = json.loads(outcomes)
-
-                            for i, price in enumerate(outcome_prices):
-                                if float(price) == 1.0 and i < len(outcomes):
-                                    return outcomes[i]
+                headers=headers
+            )
+            if status == 304:
+                # Unchanged since the last check: same answer as then
+                cached = self._resolution_cache.get(market.slug)
+                return cached[1] if cached else None
+            if status == 200:
+                etag = resp_headers.get("ETag")
+                if etag:
+                    self._etags[market.slug] = etag
+                markets = _loads(body)
+                if markets:
+                    market_data = markets[0] if isinstance(markets, list) else markets
+                    if market_data.get("closed"):
+                        outcome_prices = market_data.get("outcomePrices", "[]")
+                        outcomes = market_data.get("outcomes", "[]")
+
+                        if isinstance(outcome_prices, str):
+                            outcome_prices = _loads(outcome_prices)
+                        if isinstance(outcomes, str):
+                            outcomes = _loads(outcomes)
+
+                        for i, price in enumerate(outcome_prices):
+                            if float(price) == 1.0 and i < len(outcomes):
+                                return outcomes[i]
         except Exception as e:
             print(f"[Resolver] Error fetching resolution for {market.slug}: {e}")
         return None
@@ -213,41 +393,89 @@ class MarketResolver:
         """Check for markets that have ended and fetch their trades."""
         now = int(time.time())
 
-        for slug, market in list(self.pending_markets.items()):
-            # Wait for market to end + delay buffer
-            if now <= market.end_timestamp + self.resolution_delay:
-                continue
-
-            print(f"[Resolver] Processing resolved market: {slug}")
-
-            async with aiohttp.ClientSession() as session:
-                # Fetch all trades
-                trades = await self._fetch_trades_for_market(session, market)
+        # Pop markets whose end + delay buffer has passed, earliest first.
+        # Entries for markets no longer pending (completed, stale) are skipped
+        due: Dict[str, PendingMarket] = {}
+        heap = self._deadlines
+        while heap and heap[0][0] < now:
+            _, slug = heapq.heappop(heap)
+            market = self.pending_markets.get(slug)
+            if market is not None and now > market.end_timestamp + self.resolution_delay:
+                due[slug] = market
+        if not due:
+            return
 
-                # Fetch winning outcome
-                winning_outcome = await self._fetch_market_resolution(session, market)
+        # Resolve every due market at once; a market whose trades could not all
+        # be fetched stays pending and is rescheduled retry_interval from now
+        session = await self._get_session()
+        markets = list(due.values())
+        results = await asyncio.gather(
+            *(self._resolve_one(session, market) for market in markets),
+            return_exceptions=True
+        )
+        for market, result in zip(markets, results):
+            if isinstance(result, Exception):
+                print(f"[Resolver] Error resolving {market.slug}: {result}")
+                if market.slug in self.pending_markets:
+                    heapq.heappush(heap, (now + self.retry_interval, market.slug))
+
+        # Cleanup old completed markets (keep last 24h)
+        self._cleanup_old_completed()
+
+    async def _resolve_one(self, session: aiohttp.ClientSession, market: PendingMarket):
+        """Fetch a resolved market's trades and winner, hand them off and mark it completed.
+
+        Raises if any trades page failed; nothing is delivered in that case.
+        If the winner isn't published yet the market stays pending and only
+        its resolution is re-checked, every UNRESOLVED_RETRY_SECONDS, for up
+        to MAX_RESOLUTION_WAIT_SECONDS.
+        """
+        slug = market.slug
+        print(f"[Resolver] Processing resolved market: {slug}")
+
+        total_trades = self._awaiting_winner.get(slug)
+        if total_trades is None:
+            # Fetch all trades and the winning outcome together
+            total_trades, winning_outcome = await asyncio.gather(
+                self._fetch_trades_for_market(session, market),
+                self._fetch_market_resolution(session, market)
+            )
+        else:
+            # Trades already delivered on an earlier pass
+            winning_outcome = await self._fetch_market_resolution(session, market)
 
-                print(f"[Resolver] {slug}: {len(trades)} total trades, winner: {winning_outcome}")
+        now = int(time.time())
+        if winning_outcome is None and now < market.end_timestamp + self.resolution_delay + MAX_RESOLUTION_WAIT_SECONDS:
+            # Winner not published yet: keep the market pending and check again
+            self._awaiting_winner[slug] = total_trades
+            heapq.heappush(self._deadlines, (now + UNRESOLVED_RETRY_SECONDS, slug))
+            print(f"[Resolver] {slug}: {total_trades} total trades, winner not known yet")
+            return
+        self._awaiting_winner.pop(slug, None)
 
-                # Callback with results
-                if self.on_trades_fetched:
-                    await self.on_trades_fetched(slug, trades, winning_outcome)
+        print(f"[Resolver] {slug}: {total_trades} total trades, winner: {winning_outcome}")
 
-            # Mark as completed with timestamp
-            self.completed_markets.add(slug)
-            self._completion_times[slug] = int(time.time())
-            del self.pending_markets[slug]
+        # Every wallet's pages came back and the trades were handed over. Mark
+        # completed (with timestamp) before the callback, so an error there
+        # can't cause the trades to be fetched and delivered a second time
+        self.completed_markets.add(slug)
+        self._completion_times[slug] = int(time.time())
+        self.pending_markets.pop(slug, None)
 
-            # Cleanup old completed markets (keep last 24h)
-            self._cleanup_old_completed()
+        # Callback with results
+        if self.on_market_resolved:
+            await self.on_market_resolved(slug, total_trades, winning_outcome)
 
     def _cleanup_old_completed(self):
         """Keep only markets completed in last 24 hours to prevent memory bloat."""
-        cutoff = int(time.time()) - (24 * 3600)
+        cutoff = int(time.time()) - COMPLETED_RETENTION_SECONDS
         old_slugs = [s for s, t in self._completion_times.items() if t < cutoff]
         for slug in old_slugs:
             self.completed_markets.discard(slug)
             self._completion_times.pop(slug, None)
+            self._resolution_cache.pop(slug, None)
+            self._etags.pop(slug, None)
+            self._awaiting_winner.pop(slug, None)
         if old_slugs:
             print(f"[Resolver] Cleaned up {len(old_slugs)} old completed markets")
 
@@ -257,51 +485,54 @@ class MarketResolver:
         stale = [s for s, m in self.pending_markets.items() if m.end_timestamp < cutoff]
         for slug in stale:
             del self.pending_markets[slug]
+            self._resolution_cache.pop(slug, None)
+            self._etags.pop(slug, None)
+            self._awaiting_winner.pop(slug, None)
         if stale:
             print(f"[Resolver] Removed {len(stale)} stale pending markets (>{max_age_days} days old)")
 
-    def _get_next_resolution_time(self) -> int:
-        """Get the timestamp when the next market will be ready for resolution."""
-        if not self.pending_markets:
-            return 0
-
-        # Find the earliest end_timestamp + delay
-        earliest = min(
-            m.end_timestamp + self.resolution_delay
-            for m in self.pending_markets.values()
-        )
-        return earliest
+    def _next_wake_timeout(self) -> Optional[float]:
+        """Seconds until run() should check again (None: nothing pending, wait for add_market)."""
+        heap = self._deadlines
+        while heap and heap[0][1] not in self.pending_markets:
+            heapq.heappop(heap)  # Drop entries for markets that are gone
+        if not heap:
+            return None
+        # +1 so the strict "now > deadline" check passes on wake-up
+        return max(0.0, heap[0][0] + 1 - time.time())
 
     async def run(self, check_interval: int = 30):
         """Main loop - smart scheduling based on known market end times."""
         self.running = True
+        self.retry_interval = check_interval
         print(f"[Resolver] Started (delay: {self.resolution_delay}s)")
 
-        while self.running:
-            try:
-                await self.check_and_resolve()
-                # Also cleanup any stale pending markets (older than 7 days)
-                self._cleanup_stale_pending()
-            except Exception as e:
-                print(f"[Resolver] Error: {e}")
-
-            # Calculate optimal sleep time based on next market resolution
-            now = int(time.time())
-            next_resolution = self._get_next_resolution_time()
-
-            if next_resolution > 0 and next_resolution > now:
-                # Sleep until next market is ready (max 60s to pick up new markets)
-                sleep_time = min(next_resolution - now + 5, 60)  # +5s buffer
-                print(f"[Resolver] Next check in {sleep_time}s (market ready at {next_resolution - now}s)")
-            else:
-                # No pending markets or already past due - check again in 30s
-                sleep_time = check_interval
-
-            await asyncio.sleep(sleep_time)
+        try:
+            while self.running:
+                # Cleared before checking so a market added meanwhile still wakes us
+                self._wake.clear()
+                try:
+                    await self.check_and_resolve()
+                    # Also cleanup any stale pending markets (older than 7 days)
+                    self._cleanup_stale_pending()
+                except Exception as e:
+                    print(f"[Resolver] Error: {e}")
+
+                # Sleep until the next market is due, or until add_market()/stop() wakes us
+                timeout = self._next_wake_timeout()
+                if timeout is not None:
+                    print(f"[Resolver] Next check in {timeout:.0f}s")
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            await self.close()
 
     def stop(self):
         """Stop the resolver loop."""
         self.running = False
+        self._wake.set()
 
     def get_pending_count(self) -> int:
         """Get number of markets waiting for resolution."""
@@ -2,8 +2,8 @@
 Pattern detector - analyzes timing, price, and hedging patterns.
 """
 
-from typing import Dict, List, Optional
-from collections import defaultdict
+from typing import Deque, Dict, List, Optional, Tuple
+from collections import defaultdict, deque
 
 from .models import (
     TradeEvent,
@@ -15,26 +15,82 @@ from .models import (
 )
 from .config import TARGET_WALLETS
 
+MAX_HISTORY_PER_MARKET = 100  # Trades kept per wallet/market
+
 
 class PatternDetector:
     """Detects and analyzes trading patterns for bot wallets."""
 
     def __init__(self):
-        # trade_history[wallet][market_slug] = List[TradeEvent]
-        self.trade_history: Dict[str, Dict[str, List[TradeEvent]]] = defaultdict(lambda: defaultdict(list))
+        # trade_history[(wallet, market_slug)] = last MAX_HISTORY_PER_MARKET trades
+        self.trade_history: Dict[Tuple[str, str], Deque[TradeEvent]] = {}
+        # _pattern_cache[(wallet, market_slug)] = (inputs key, analysis dict);
+        # dropped by record_trade, so a hit means no new trades since
+        self._pattern_cache: Dict[Tuple[str, str], Tuple[tuple, dict]] = {}
+        # Running sums over the same (capped) history, so analyze_price
+        # doesn't rescan it:
+        # _price_totals[(wallet, market_slug)][(outcome, side)] = [count, shares, shares * price]
+        # (outcome as received; case is folded per bucket when read, not per trade)
+        self._price_totals: Dict[Tuple[str, str], Dict[Tuple[str, str], List[float]]] = defaultdict(dict)
+        self._maker_counts: Dict[Tuple[str, str], int] = defaultdict(int)
+        # (first_ts, last_ts) of each history; None after the trade holding a
+        # bound is evicted (trades can arrive out of order), rescanned on demand
+        self._ts_bounds: Dict[Tuple[str, str], Optional[Tuple[int, int]]] = {}
 
     def record_trade(self, trade: TradeEvent):
         """Record a trade for pattern analysis (keeps last 100 per wallet/market)."""
-        wallet = trade.wallet.lower()
-        market = trade.market_slug
-        self.trade_history[wallet][market].append(trade)
-        # Limit memory: keep last 100 trades per wallet/market
-        if len(self.trade_history[wallet][market]) > 100:
-            self.trade_history[wallet][market] = self.trade_history[wallet][market][-100:]
-
-    def get_trades(self, wallet: str, market_slug: str) -> List[TradeEvent]:
+        key = (trade.wallet.lower(), trade.market_slug)
+        trades = self.trade_history.get(key)
+        ts = trade.timestamp
+        if trades is None:
+            trades = self.trade_history[key] = deque(maxlen=MAX_HISTORY_PER_MARKET)
+            self._ts_bounds[key] = (ts, ts)
+        else:
+            bounds = self._ts_bounds.get(key)
+            if len(trades) == MAX_HISTORY_PER_MARKET:
+                # The deque drops its oldest trade on append; take it out of the sums first
+                evicted = trades[0]
+                self._add_to_totals(key, evicted, -1)
+                if bounds is not None and evicted.timestamp in bounds:
+                    bounds = None
+            if bounds is not None:
+                bounds = (min(bounds[0], ts), max(bounds[1], ts))
+            self._ts_bounds[key] = bounds
+        trades.append(trade)
+        self._pattern_cache.pop(key, None)
+        self._add_to_totals(key, trade, 1)
+
+    def _add_to_totals(self, key: Tuple[str, str], trade: TradeEvent, sign: int):
+        """Add (sign=1) or remove (sign=-1) a trade's contribution to the running sums."""
+        buckets = self._price_totals[key]
+        bucket_key = (trade.outcome, trade.side)
+        bucket = buckets.get(bucket_key)
+        if bucket is None:
+            bucket = buckets[bucket_key] = [0, 0.0, 0.0]
+        bucket[0] += sign
+        if bucket[0] == 0:
+            # Drop emptied buckets instead of keeping float residue around
+            del buckets[bucket_key]
+        else:
+            bucket[1] += sign * trade.shares
+            bucket[2] += sign * trade.price * trade.shares
+        if trade.role == "maker":
+            self._maker_counts[key] += sign
+
+    def get_trades(self, wallet: str, market_slug: str) -> Deque[TradeEvent]:
         """Get all trades for a wallet in a market."""
-        return self.trade_history.get(wallet.lower(), {}).get(market_slug, [])
+        return self.trade_history.get((wallet.lower(), market_slug), deque())
+
+    def clear(self):
+        """Forget all recorded trades and cached analyses."""
+        self.trade_history.clear()
+        self._pattern_cache.clear()
+        self._price_totals.clear()
+        self._maker_counts.clear()
+        self._ts_bounds.clear()
+
+    # The pattern models below are built with model_construct: every field is
+    # computed here with the right type, so pydantic validation is skipped
 
     def analyze_timing(
         self,
@@ -51,18 +107,21 @@ class PatternDetector:
 
         wallet_name = TARGET_WALLETS.get(wallet, wallet[:10])
 
-        # Get trade timestamps
-        timestamps = [t.timestamp for t in trades]
-        first_ts = min(timestamps)
-        last_ts = max(timestamps)
+        # First/last trade times, kept up to date by record_trade
+        key = (wallet, market_slug)
+        bounds = self._ts_bounds.get(key)
+        if bounds is None:
+            timestamps = [t.timestamp for t in trades]
+            bounds = self._ts_bounds[key] = (min(timestamps), max(timestamps))
+        first_ts, last_ts = bounds
 
         # Calculate trading window
-        trading_window_mins = (last_ts - first_ts) / 60 if last_ts > first_ts else 0
-        trades_per_minute = len(trades) / trading_window_mins if trading_window_mins > 0 else len(trades)
+        trading_window_mins = (last_ts - first_ts) / 60 if last_ts > first_ts else 0.0
+        trades_per_minute = len(trades) / trading_window_mins if trading_window_mins > 0 else float(len(trades))
 
         # Calculate timing relative to market
-        time_to_start_mins = 0
-        time_to_end_mins = 0
+        time_to_start_mins = 0.0
+        time_to_end_mins = 0.0
         early_trader = False
         late_closer = False
 
@@ -76,7 +135,7 @@ class PatternDetector:
             early_trader = time_to_start_mins < 2  # Within 2 minutes of market open
             late_closer = time_to_end_mins < 2  # Within 2 minutes of market close
 
-        return TimingPattern(
+        return TimingPattern.model_construct(
             wallet=wallet,
             wallet_name=wallet_name,
             market_slug=market_slug,
@@ -102,45 +161,43 @@ class PatternDetector:
 
         wallet_name = TARGET_WALLETS.get(wallet, wallet[:10])
 
-        # Separate trades by outcome and side
-        up_buys = [t for t in trades if t.outcome.lower() == "up" and t.side == "BUY"]
-        down_buys = [t for t in trades if t.outcome.lower() == "down" and t.side == "BUY"]
-        up_sells = [t for t in trades if t.outcome.lower() == "up" and t.side == "SELL"]
-        down_sells = [t for t in trades if t.outcome.lower() == "down" and t.side == "SELL"]
+        # Merge buckets whose outcomes differ only by case ("Up" / "UP")
+        totals: Dict[Tuple[str, str], List[float]] = {}
+        for (outcome, side), (_, shares, notional) in self._price_totals.get((wallet, market_slug), {}).items():
+            merged = totals.setdefault((outcome.lower(), side), [0.0, 0.0])
+            merged[0] += shares
+            merged[1] += notional
 
         # Calculate weighted average prices
-        def weighted_avg(trades: List[TradeEvent]) -> float:
-            if not trades:
-                return 0
-            total_shares = sum(t.shares for t in trades)
-            if total_shares == 0:
-                return 0
-            return sum(t.price * t.shares for t in trades) / total_shares
-
-        avg_buy_up = weighted_avg(up_buys)
-        avg_buy_down = weighted_avg(down_buys)
-        avg_sell_up = weighted_avg(up_sells)
-        avg_sell_down = weighted_avg(down_sells)
-
-        combined_buy_price = 0
+        def weighted_avg(outcome: str, side: str) -> float:
+            bucket = totals.get((outcome, side))
+            if bucket is None or bucket[0] == 0:
+                return 0.0
+            return bucket[1] / bucket[0]
+
+        avg_buy_up = weighted_avg("up", "BUY")
+        avg_buy_down = weighted_avg("down", "BUY")
+        avg_sell_up = weighted_avg("up", "SELL")
+        avg_sell_down = weighted_avg("down", "SELL")
+
+        combined_buy_price = 0.0
         if avg_buy_up > 0 and avg_buy_down > 0:
             combined_buy_price = avg_buy_up + avg_buy_down
 
         # Spread captured (profit potential per share)
-        spread_captured = 0
+        spread_captured = 0.0
         if avg_sell_up > 0 and avg_buy_up > 0:
             spread_captured += (avg_sell_up - avg_buy_up)
         if avg_sell_down > 0 and avg_buy_down > 0:
             spread_captured += (avg_sell_down - avg_buy_down)
 
         # Maker percentage
-        maker_trades = sum(1 for t in trades if t.role == "maker")
-        maker_percentage = maker_trades / len(trades) if trades else 0
+        maker_percentage = self._maker_counts.get((wallet, market_slug), 0) / len(trades)
 
         # Check if buying below $1 combined (arbitrage signal)
         bought_below_dollar = combined_buy_price < 1.0 if combined_buy_price > 0 else False
 
-        return PricePattern(
+        return PricePattern.model_construct(
             wallet=wallet,
             wallet_name=wallet_name,
             market_slug=market_slug,
@@ -182,7 +239,7 @@ class PatternDetector:
         else:
             strategy_type = "MIXED"
 
-        return HedgePattern(
+        return HedgePattern.model_construct(
             wallet=position.wallet,
             wallet_name=position.wallet_name,
             market_slug=position.market_slug,
@@ -203,15 +260,28 @@ class PatternDetector:
         market_context: Optional[MarketContext] = None
     ) -> dict:
         """Get complete pattern analysis for a wallet in a market."""
+        # Besides the trade history, the result depends on the position
+        # (hedge) and the market window (timing)
+        cache_key = (wallet.lower(), market_slug)
+        inputs = (
+            (position.total_trades, position.last_trade_ts) if position else None,
+            (market_context.start_date, market_context.end_date) if market_context else None,
+        )
+        cached = self._pattern_cache.get(cache_key)
+        if cached is not None and cached[0] == inputs:
+            return cached[1]
+
         timing = self.analyze_timing(wallet, market_slug, market_context)
         price = self.analyze_price(wallet, market_slug)
         hedge = self.analyze_hedge(position) if position else None
 
-        return {
+        analysis = {
             "timing": timing.model_dump() if timing else None,
             "price": price.model_dump() if price else None,
             "hedge": hedge.model_dump() if hedge else None
         }
+        self._pattern_cache[cache_key] = (inputs, analysis)
+        return analysis
 
     def get_all_patterns(
         self,
@@ -221,31 +291,21 @@ class PatternDetector:
         """Get patterns for all tracked wallet/market combinations."""
         patterns = {}
 
-        for wallet in self.trade_history:
-            for market_slug in self.trade_history[wallet]:
-                key = f"{wallet}:{market_slug}"
-                position = positions.get(key)
-                market = market_contexts.get(market_slug)
+        for wallet, market_slug in self.trade_history:
+            key = f"{wallet}:{market_slug}"
+            position = positions.get(key)
+            market = market_contexts.get(market_slug)
 
-                patterns[key] = self.get_full_analysis(
-                    wallet, market_slug, position, market
-                )
+            patterns[key] = self.get_full_analysis(
+                wallet, market_slug, position, market
+            )
 
         return patterns
 
     def get_summary_stats(self) -> dict:
         """Get summary statistics across all trades."""
-        total_trades = 0
-        total_wallets = len(self.trade_history)
-        total_markets = set()
-
-        for wallet in self.trade_history:
-            for market_slug, trades in self.trade_history[wallet].items():
-                total_trades += len(trades)
-                total_markets.add(market_slug)
-
         return {
-            "total_trades": total_trades,
-            "total_wallets": total_wallets,
-            "total_markets": len(total_markets)
+            "total_trades": sum(len(trades) for trades in self.trade_history.values()),
+            "total_wallets": len({wallet for wallet, _ in self.trade_history}),
+            "total_markets": len({market_slug for _, market_slug in self.trade_history})
         }
@@ -2,7 +2,7 @@
 Position tracker - maintains running positions per wallet per market.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 from collections import defaultdict
 
 from .models import TradeEvent, WalletPosition
@@ -14,29 +14,78 @@ class PositionTracker:
     def __init__(self):
         # positions[wallet][market_slug] = WalletPosition
         self.positions: Dict[str, Dict[str, WalletPosition]] = defaultdict(dict)
-        # Track total shares bought (not net) for avg price calculation
-        self._up_shares_bought: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
-        self._down_shares_bought: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+        # Same positions indexed by market: _by_market[market_slug][wallet]
+        self._by_market: Dict[str, Dict[str, WalletPosition]] = defaultdict(dict)
+        # Lowercased wallet/outcome strings; both come from small fixed sets,
+        # so each distinct spelling is lowered once
+        self._lowered: Dict[str, str] = {}
+        # Running totals for get_summary (kept in step with the dicts above)
+        self._position_count = 0
+        self._trade_count = 0
+        # Total shares bought (not net) per (wallet, market_slug), for avg price calculation
+        self._up_shares_bought: Dict[Tuple[str, str], float] = {}
+        self._down_shares_bought: Dict[Tuple[str, str], float] = {}
 
     def update_position(self, trade: TradeEvent) -> WalletPosition:
         """Update position based on a new trade."""
-        wallet = trade.wallet.lower()
+        pos, wallet, market, changed = self._apply_trade(trade)
+        if changed:
+            self._recalculate_metrics(pos, wallet, market)
+        return pos
+
+    def update_positions(self, trades: List[TradeEvent]) -> List[WalletPosition]:
+        """
+        Apply a batch of trades, recalculating derived metrics once per
+        affected position instead of once per trade.
+
+        Returns:
+            The updated positions (one per wallet/market touched)
+        """
+        touched: Dict[Tuple[str, str], WalletPosition] = {}
+        stale = set()
+        for trade in trades:
+            pos, wallet, market, changed = self._apply_trade(trade)
+            touched[(wallet, market)] = pos
+            if changed:
+                stale.add((wallet, market))
+        for key in stale:
+            self._recalculate_metrics(touched[key], *key)
+        return list(touched.values())
+
+    def _apply_trade(self, trade: TradeEvent) -> Tuple[WalletPosition, str, str, bool]:
+        """
+        Apply a trade to its position's counters and shares (derived metrics not updated).
+
+        Returns:
+            (position, wallet, market, changed) - changed is False when the trade
+            left every input of _recalculate_metrics as it was
+        """
+        lowered = self._lowered
+        wallet = lowered.get(trade.wallet)
+        if wallet is None:
+            wallet = lowered[trade.wallet] = trade.wallet.lower()
         market = trade.market_slug
+        is_buy = trade.side == "BUY"
 
         # Create position if it doesn't exist
-        if market not in self.positions[wallet]:
-            self.positions[wallet][market] = WalletPosition(
+        pos = self.positions[wallet].get(market)
+        if pos is None:
+            pos = self.positions[wallet][market] = WalletPosition(
                 wallet=wallet,
                 wallet_name=trade.wallet_name,
                 market_slug=market,
                 first_trade_ts=trade.timestamp
             )
-
-        pos = self.positions[wallet][market]
+            self._by_market[market][wallet] = pos
+            self._position_count += 1
+            changed = True  # Derived fields still hold model defaults
+        else:
+            changed = False
 
         # Update trade counts
         pos.total_trades += 1
-        if trade.side == "BUY":
+        self._trade_count += 1
+        if is_buy:
             pos.buy_trades += 1
         else:
             pos.sell_trades += 1
@@ -53,37 +102,41 @@ class PositionTracker:
             pos.last_trade_ts = trade.timestamp
 
         # Update position based on trade
-        outcome = trade.outcome.lower()
+        outcome = lowered.get(trade.outcome)
+        if outcome is None:
+            outcome = lowered[trade.outcome] = trade.outcome.lower()
 
-        if trade.side == "BUY":
+        # Derived metrics only depend on shares, costs and shares bought, which a
+        # zero-size trade or an unrecognised outcome doesn't touch
+        if outcome == "up" or outcome == "down":
+            changed = changed or trade.shares != 0 or (is_buy and trade.usdc != 0)
+
+        if is_buy:
             if outcome == "up":
                 pos.up_shares += trade.shares
                 pos.up_cost += trade.usdc
-                self._up_shares_bought[wallet][market] += trade.shares
+                key = (wallet, market)
+                self._up_shares_bought[key] = self._up_shares_bought.get(key, 0.0) + trade.shares
             elif outcome == "down":
                 pos.down_shares += trade.shares
                 pos.down_cost += trade.usdc
-                self._down_shares_bought[wallet][market] += trade.shares
+                key = (wallet, market)
+                self._down_shares_bought[key] = self._down_shares_bought.get(key, 0.0) + trade.shares
 
         else:  # SELL
+            # Clamped per trade (can go negative with sells), so a batch
+            # ends up where trade-by-trade updates would
             if outcome == "up":
-                pos.up_shares -= trade.shares
+                pos.up_shares = max(0, pos.up_shares - trade.shares)
                 pos.up_revenue += trade.usdc
             elif outcome == "down":
-                pos.down_shares -= trade.shares
+                pos.down_shares = max(0, pos.down_shares - trade.shares)
                 pos.down_revenue += trade.usdc
 
-        # Recalculate derived metrics
-        self._recalculate_metrics(pos, wallet, market)
-
-        return pos
+        return pos, wallet, market, changed
 
     def _recalculate_metrics(self, pos: WalletPosition, wallet: str, market: str):
         """Recalculate derived position metrics."""
-        # Ensure non-negative (can go negative with sells)
-        pos.up_shares = max(0, pos.up_shares)
-        pos.down_shares = max(0, pos.down_shares)
-
         # Complete sets = min of up and down shares
         pos.complete_sets = min(pos.up_shares, pos.down_shares)
 
@@ -92,8 +145,9 @@ class PositionTracker:
         pos.unhedged_down = max(0, pos.down_shares - pos.up_shares)
 
         # Average prices (based on total cost / total shares bought, not net)
-        up_bought = self._up_shares_bought[wallet][market]
-        down_bought = self._down_shares_bought[wallet][market]
+        key = (wallet, market)
+        up_bought = self._up_shares_bought.get(key, 0.0)
+        down_bought = self._down_shares_bought.get(key, 0.0)
 
         pos.avg_up_price = pos.up_cost / up_bought if up_bought > 0 else 0
         pos.avg_down_price = pos.down_cost / down_bought if down_bought > 0 else 0
@@ -114,6 +168,27 @@ class PositionTracker:
         else:
             pos.hedge_ratio = 1.0  # No position = perfectly hedged
 
+    def restore_position(self, position: WalletPosition):
+        """Add a position loaded from storage."""
+        wallet = position.wallet.lower()
+        replaced = self.positions[wallet].get(position.market_slug)
+        if replaced is not None:
+            self._trade_count -= replaced.total_trades
+        else:
+            self._position_count += 1
+        self._trade_count += position.total_trades
+        self.positions[wallet][position.market_slug] = position
+        self._by_market[position.market_slug][wallet] = position
+
+    def clear(self):
+        """Forget all positions."""
+        self.positions.clear()
+        self._by_market.clear()
+        self._up_shares_bought.clear()
+        self._down_shares_bought.clear()
+        self._position_count = 0
+        self._trade_count = 0
+
     def get_position(self, wallet: str, market_slug: str) -> WalletPosition:
         """Get position for a specific wallet and market."""
         wallet = wallet.lower()
@@ -126,11 +201,7 @@ class PositionTracker:
 
     def get_market_positions(self, market_slug: str) -> List[WalletPosition]:
         """Get all positions for a specific market."""
-        positions = []
-        for wallet_positions in self.positions.values():
-            if market_slug in wallet_positions:
-                positions.append(wallet_positions[market_slug])
-        return positions
+        return list(self._by_market.get(market_slug, {}).values())
 
     def get_all_positions(self) -> List[WalletPosition]:
         """Get all current positions."""
@@ -141,33 +212,29 @@ class PositionTracker:
 
     def get_active_markets(self) -> List[str]:
         """Get list of all markets with positions."""
-        markets = set()
-        for wallet_positions in self.positions.values():
-            markets.update(wallet_positions.keys())
-        return list(markets)
+        return list(self._by_market)
 
     def get_summary(self) -> dict:
-        """Get summary statistics."""
-        all_positions = self.get_all_positions()
-        total_trades = sum(p.total_trades for p in all_positions)
-
+        """Get summary statistics (O(1): counts are maintained as positions change)."""
         return {
             "total_wallets": len(self.positions),
-            "total_markets": len(self.get_active_markets()),
-            "total_positions": len(all_positions),
-            "total_trades": total_trades,
+            "total_markets": len(self._by_market),
+            "total_positions": self._position_count,
+            "total_trades": self._trade_count,
         }
 
     def cleanup_resolved_markets(self, resolved_slugs: List[str]):
         """Remove positions for resolved markets to prevent memory bloat."""
         removed_count = 0
-        for wallet in list(self.positions.keys()):
-            for slug in resolved_slugs:
-                if slug in self.positions[wallet]:
-                    del self.positions[wallet][slug]
-                    removed_count += 1
-                self._up_shares_bought[wallet].pop(slug, None)
-                self._down_shares_bought[wallet].pop(slug, None)
+        for slug in resolved_slugs:
+            # Only the wallets that hold a position in this market
+            for wallet, pos in self._by_market.pop(slug, {}).items():
+                del self.positions[wallet][slug]
+                removed_count += 1
+                self._position_count -= 1
+                self._trade_count -= pos.total_trades
+                self._up_shares_bought.pop((wallet, slug), None)
+                self._down_shares_bought.pop((wallet, slug), None)
 
         if removed_count:
             print(f"[PositionTracker] Cleaned up {removed_count} positions")
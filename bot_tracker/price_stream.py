@@ -5,7 +5,8 @@ Connects to wss://ws-subscriptions-clob.polymarket.com/ws/market
 
 import asyncio
 import json
-from typing import Dict, Set, Callable, Awaitable, Optional
+import time
+from typing import Dict, List, Set, Callable, Awaitable, Optional
 from datetime import datetime
 from dataclasses import dataclass
 
@@ -15,9 +16,25 @@ try:
 except ImportError:
     WEBSOCKETS_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .config import POLYMARKET_WS_URL
 
 
+def _loads(raw):
+    """Parse a WebSocket frame (orjson if available)."""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
+def _dumps(obj) -> str:
+    """Serialize an outgoing WebSocket message (orjson if available)."""
+    return orjson.dumps(obj).decode() if ORJSON_AVAILABLE else json.dumps(obj)
+
+
 @dataclass
 class PriceUpdate:
     """Real-time price update from WebSocket."""
@@ -48,10 +65,19 @@ class PriceStream:
     def __init__(
         self,
         on_price_update: Optional[Callable[[PriceUpdate], Awaitable[None]]] = None,
-        on_trade: Optional[Callable[[TradeExecution], Awaitable[None]]] = None
+        on_trade: Optional[Callable[[TradeExecution], Awaitable[None]]] = None,
+        on_price_updates: Optional[Callable[[List[PriceUpdate]], Awaitable[None]]] = None
     ):
+        """
+        Args:
+            on_price_update: Called per (throttled) price update
+            on_trade: Called per trade execution
+            on_price_updates: Called once per message with all of its (throttled)
+                              price updates; takes precedence over on_price_update
+        """
         self.on_price_update = on_price_update
         self.on_trade = on_trade
+        self.on_price_updates = on_price_updates
         self.subscribed_assets: Set[str] = set()
         self.asset_metadata: Dict[str, dict] = {}  # asset_id -> {market_slug, outcome}
         self.running = False
@@ -61,7 +87,9 @@ class PriceStream:
         self.save_interval = 1.0  # Only save prices every 1 second per asset
 
     def add_asset(self, asset_id: str, market_slug: str, outcome: str):
-        """Add an asset to track."""
+        """Add an asset to track (no-op if already tracked)."""
+        if asset_id in self.subscribed_assets:
+            return
         self.subscribed_assets.add(asset_id)
         self.asset_metadata[asset_id] = {
             "market_slug": market_slug,
@@ -88,7 +116,7 @@ class PriceStream:
             "assets_ids": asset_ids  # Note: Polymarket API uses "assets_ids" (plural)
         }
 
-        await self.ws.send(json.dumps(message))
+        await self.ws.send(_dumps(message))
         print(f"Subscribed to {len(asset_ids)} assets")
 
     async def handle_message(self, data: dict):
@@ -102,17 +130,36 @@ class PriceStream:
         elif event_type == "book":
             await self._handle_book(data)
 
+    def _due_for_save(self, asset_id: str, current_time: float) -> bool:
+        """Throttle: True at most once per save_interval per asset."""
+        if current_time - self.last_save_time.get(asset_id, 0) < self.save_interval:
+            return False
+        self.last_save_time[asset_id] = current_time
+        return True
+
+    async def _emit(self, updates: List[PriceUpdate]):
+        """Hand throttled updates to the callbacks (one batch call if supported)."""
+        if not updates:
+            return
+        if self.on_price_updates:
+            await self.on_price_updates(updates)
+        elif self.on_price_update:
+            for update in updates:
+                await self.on_price_update(update)
+
     async def _handle_price_change(self, data: dict):
-        """Handle price change event."""
-        import time
+        """Handle price change event (all changes in the message are emitted together)."""
         current_time = time.time()
+        timestamp = int(data.get("timestamp", 0)) // 1000  # ms to seconds
+        metadata = self.asset_metadata
+        due = []
 
         for change in data.get("price_changes", []):
             asset_id = change.get("asset_id")
-            if asset_id not in self.asset_metadata:
+            meta = metadata.get(asset_id)
+            if meta is None:
                 continue
 
-            meta = self.asset_metadata[asset_id]
             update = PriceUpdate(
                 asset_id=asset_id,
                 market_slug=meta["market_slug"],
@@ -120,18 +167,17 @@ class PriceStream:
                 price=float(change.get("price", 0)),
                 best_bid=float(change.get("best_bid", 0)),
                 best_ask=float(change.get("best_ask", 0)),
-                timestamp=int(data.get("timestamp", 0)) // 1000  # ms to seconds
+                timestamp=timestamp
             )
 
             # Always update in-memory latest price
             self.latest_prices[asset_id] = update
 
             # Only save to storage if enough time has passed (throttle)
-            last_save = self.last_save_time.get(asset_id, 0)
-            if current_time - last_save >= self.save_interval:
-                self.last_save_time[asset_id] = current_time
-                if self.on_price_update:
-                    await self.on_price_update(update)
+            if self._due_for_save(asset_id, current_time):
+                due.append(update)
+
+        await self._emit(due)
 
     async def _handle_trade(self, data: dict):
         """Handle trade execution event."""
@@ -155,7 +201,6 @@ class PriceStream:
 
     async def _handle_book(self, data: dict):
         """Handle orderbook snapshot."""
-        import time
         current_time = time.time()
 
         asset_id = data.get("asset_id")
@@ -184,11 +229,8 @@ class PriceStream:
         self.latest_prices[asset_id] = update
 
         # Only save to storage if enough time has passed (throttle)
-        last_save = self.last_save_time.get(asset_id, 0)
-        if current_time - last_save >= self.save_interval:
-            self.last_save_time[asset_id] = current_time
-            if self.on_price_update:
-                await self.on_price_update(update)
+        if self._due_for_save(asset_id, current_time):
+            await self._emit([update])
 
     def get_latest_price(self, asset_id: str) -> Optional[PriceUpdate]:
         """Get the latest price for an asset."""
@@ -231,7 +273,7 @@ class PriceStream:
                     # Listen for messages
                     async for message in ws:
                         try:
-                            data = json.loads(message)
+                            data = _loads(message)
                             # First message after subscribe is a list (orderbook snapshot)
                             if isinstance(data, list):
                                 for item in data:
@@ -239,7 +281,7 @@ class PriceStream:
                                         await self.handle_message(item)
                             else:
                                 await self.handle_message(data)
-                        except json.JSONDecodeError:
+                        except json.JSONDecodeError:  # orjson's error subclasses it
                             print(f"Invalid JSON: {message[:100]}")
                         except Exception as e:
                             print(f"Error handling message: {e}")
@@ -7,6 +7,7 @@ import sqlite3
 import json
 import os
 import shutil
+import threading
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict
 from pathlib import Path
@@ -44,7 +45,10 @@ class SQLiteStorage:
         # Check for JSON migration
         self._migrate_from_json_if_needed()
 
-        # Connect to database
+        # Connect to database. The connection is shared by the storage writer
+        # thread and API handlers on the event loop, so every use of it holds
+        # _lock (re-entrant: flush() calls the other locked methods)
+        self._lock = threading.RLock()
         self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
 
@@ -143,12 +147,24 @@ class SQLiteStorage:
                 trades_count INTEGER DEFAULT 0
             );
 
+            -- Markets whose post-close trades the resolver has fetched
+            CREATE TABLE IF NOT EXISTS completed_markets (
+                slug TEXT PRIMARY KEY,
+                completed_at INTEGER NOT NULL,
+                total_trades INTEGER DEFAULT 0
+            );
+
             -- Create indexes for query performance
             CREATE INDEX IF NOT EXISTS idx_trades_wallet ON trades(wallet);
             CREATE INDEX IF NOT EXISTS idx_trades_market ON trades(market_slug);
             CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp DESC);
-            CREATE INDEX IF NOT EXISTS idx_prices_market ON prices(market_slug);
             CREATE INDEX IF NOT EXISTS idx_prices_timestamp ON prices(timestamp DESC);
+
+            -- Prices are keyed by (market_slug, timestamp): serves the per-market
+            -- query without a sort and replaces the single-column market index,
+            -- which only added write cost to every price insert
+            CREATE INDEX IF NOT EXISTS idx_prices_market_ts ON prices(market_slug, timestamp DESC);
+            DROP INDEX IF EXISTS idx_prices_market;
         """)
         self.conn.commit()
 
@@ -363,23 +379,24 @@ class SQLiteStorage:
 
     def _create_backup(self, backup_type: str = "manual"):
         """Create a backup of the database."""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name = f"tracker_{backup_type}_{timestamp}.db"
-        backup_path = self.backup_dir / backup_name
-
-        try:
-            # Use SQLite backup API for consistent backup
-            backup_conn = sqlite3.connect(str(backup_path))
-            self.conn.backup(backup_conn)
-            backup_conn.close()
-            print(f"Backup created: {backup_name}")
-
-            # Clean up old backups (keep last 10)
-            self._cleanup_old_backups()
-            return str(backup_path)
-        except Exception as e:
-            print(f"Backup failed: {e}")
-            return None
+        with self._lock:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_name = f"tracker_{backup_type}_{timestamp}.db"
+            backup_path = self.backup_dir / backup_name
+
+            try:
+                # Use SQLite backup API for consistent backup
+                backup_conn = sqlite3.connect(str(backup_path))
+                self.conn.backup(backup_conn)
+                backup_conn.close()
+                print(f"Backup created: {backup_name}")
+
+                # Clean up old backups (keep last 10)
+                self._cleanup_old_backups()
+                return str(backup_path)
+            except Exception as e:
+                print(f"Backup failed: {e}")
+                return None
 
     def _cleanup_old_backups(self, keep_count: int = 10):
         """Remove old backup files, keeping the most recent ones."""
@@ -391,100 +408,155 @@ class SQLiteStorage:
             except Exception as e:
                 print(f"Failed to remove backup {backup.name}: {e}")
 
+    # SQL shared by the single-row save_* methods and save_batch
+    _INSERT_TRADE = """
+        INSERT OR IGNORE INTO trades
+        (id, tx_hash, timestamp, wallet, wallet_name, role, side, outcome,
+         shares, usdc, price, fee, market_slug, market_question, session_id, recorded_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    _UPSERT_POSITION = """
+        INSERT OR REPLACE INTO positions
+        (wallet, market_slug, wallet_name, up_shares, down_shares,
+         up_cost, down_cost, complete_sets, edge, hedge_ratio,
+         total_trades, avg_up_price, avg_down_price, combined_price, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    _UPSERT_MARKET = """
+        INSERT OR REPLACE INTO markets
+        (slug, question, condition_id, token_ids, outcomes,
+         start_date, end_date, resolved, winning_outcome, updated_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    _INSERT_PRICE = """
+        INSERT INTO prices
+        (timestamp, timestamp_iso, market_slug, outcome, price, best_bid, best_ask, session_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    """
+    _UPSERT_COMPLETED = """
+        INSERT OR REPLACE INTO completed_markets (slug, completed_at, total_trades)
+        VALUES (?, ?, ?)
+    """
+
+    @staticmethod
+    def _trade_key(trade: TradeEvent) -> str:
+        """Session dedup key for a trade."""
+        return f"{trade.tx_hash}:{trade.outcome}:{trade.shares}"
+
+    def _trade_row(self, trade: TradeEvent) -> tuple:
+        """Build a trades row."""
+        return (
+            trade.id,
+            trade.tx_hash,
+            trade.timestamp,
+            trade.wallet,
+            trade.wallet_name,
+            trade.role,
+            trade.side,
+            trade.outcome,
+            trade.shares,
+            trade.usdc,
+            trade.price,
+            trade.fee,
+            trade.market_slug,
+            trade.market_question,
+            self.session_id,
+            datetime.now().isoformat()
+        )
+
+    def _position_row(self, position: WalletPosition) -> tuple:
+        """Build a positions row."""
+        return (
+            position.wallet.lower(),
+            position.market_slug,
+            position.wallet_name,
+            position.up_shares,
+            position.down_shares,
+            position.up_cost,
+            position.down_cost,
+            position.complete_sets,
+            position.edge,
+            position.hedge_ratio,
+            position.total_trades,
+            position.avg_up_price,
+            position.avg_down_price,
+            position.combined_price,
+            datetime.now().isoformat()
+        )
+
+    def _market_row(self, market: MarketContext) -> tuple:
+        """Build a markets row."""
+        return (
+            market.slug,
+            market.question,
+            market.condition_id,
+            json.dumps(market.token_ids),
+            json.dumps(market.outcomes),
+            market.start_date.isoformat() if market.start_date else None,
+            market.end_date.isoformat() if market.end_date else None,
+            1 if market.resolved else 0,
+            market.winning_outcome,
+            datetime.now().isoformat()
+        )
+
+    def _price_row(
+        self,
+        market_slug: str,
+        outcome: str,
+        price: float,
+        best_bid: float,
+        best_ask: float,
+        timestamp: int = None
+    ) -> tuple:
+        """Build a prices row."""
+        if timestamp is None:
+            timestamp = int(datetime.now().timestamp())
+        return (
+            timestamp,
+            datetime.fromtimestamp(timestamp).isoformat(),
+            market_slug,
+            outcome,
+            price,
+            best_bid,
+            best_ask,
+            self.session_id
+        )
+
     def save_trade(self, trade: TradeEvent):
         """Save a single trade."""
-        trade_key = f"{trade.tx_hash}:{trade.outcome}:{trade.shares}"
-        if trade_key in self.session_trade_ids:
-            return  # Skip duplicate
-
-        self.session_trade_ids.add(trade_key)
-
-        try:
-            self.conn.execute("""
-                INSERT OR IGNORE INTO trades
-                (id, tx_hash, timestamp, wallet, wallet_name, role, side, outcome,
-                 shares, usdc, price, fee, market_slug, market_question, session_id, recorded_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                trade.id,
-                trade.tx_hash,
-                trade.timestamp,
-                trade.wallet,
-                trade.wallet_name,
-                trade.role,
-                trade.side,
-                trade.outcome,
-                trade.shares,
-                trade.usdc,
-                trade.price,
-                trade.fee,
-                trade.market_slug,
-                trade.market_question,
-                self.session_id,
-                datetime.now().isoformat()
-            ))
-            self.conn.commit()
-        except Exception as e:
-            print(f"Error saving trade: {e}")
+        with self._lock:
+            trade_key = self._trade_key(trade)
+            if trade_key in self.session_trade_ids:
+                return  # Skip duplicate
+
+            try:
+                self.conn.execute(self._INSERT_TRADE, self._trade_row(trade))
+                self.conn.commit()
+                self.session_trade_ids.add(trade_key)
+            except Exception as e:
+                print(f"Error saving trade: {e}")
 
     def save_trades(self, trades: List[TradeEvent]):
         """Save multiple trades."""
-        for trade in trades:
-            self.save_trade(trade)
+        self.save_batch([("trade", trade) for trade in trades])
 
     def save_position(self, position: WalletPosition):
         """Save/update position."""
-        try:
-            self.conn.execute("""
-                INSERT OR REPLACE INTO positions
-                (wallet, market_slug, wallet_name, up_shares, down_shares,
-                 up_cost, down_cost, complete_sets, edge, hedge_ratio,
-                 total_trades, avg_up_price, avg_down_price, combined_price, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                position.wallet.lower(),
-                position.market_slug,
-                position.wallet_name,
-                position.up_shares,
-                position.down_shares,
-                position.up_cost,
-                position.down_cost,
-                position.complete_sets,
-                position.edge,
-                position.hedge_ratio,
-                position.total_trades,
-                position.avg_up_price,
-                position.avg_down_price,
-                position.combined_price,
-                datetime.now().isoformat()
-            ))
-            self.conn.commit()
-        except Exception as e:
-            print(f"Error saving position: {e}")
+        with self._lock:
+            try:
+                self.conn.execute(self._UPSERT_POSITION, self._position_row(position))
+                self.conn.commit()
+            except Exception as e:
+                print(f"Error saving position: {e}")
 
     def save_market(self, market: MarketContext):
         """Save/update market metadata."""
-        try:
-            self.conn.execute("""
-                INSERT OR REPLACE INTO markets
-                (slug, question, condition_id, token_ids, outcomes,
-                 start_date, end_date, resolved, winning_outcome, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                market.slug,
-                market.question,
-                market.condition_id,
-                json.dumps(market.token_ids),
-                json.dumps(market.outcomes),
-                market.start_date.isoformat() if market.start_date else None,
-                market.end_date.isoformat() if market.end_date else None,
-                1 if market.resolved else 0,
-                market.winning_outcome,
-                datetime.now().isoformat()
-            ))
-            self.conn.commit()
-        except Exception as e:
-            print(f"Error saving market: {e}")
+        with self._lock:
+            try:
+                self.conn.execute(self._UPSERT_MARKET, self._market_row(market))
+                self.conn.commit()
+            except Exception as e:
+                print(f"Error saving market: {e}")
 
     def save_price_update(
         self,
@@ -496,103 +568,154 @@ class SQLiteStorage:
         timestamp: int = None
     ):
         """Save a price update."""
-        if timestamp is None:
-            timestamp = int(datetime.now().timestamp())
+        with self._lock:
+            try:
+                self.conn.execute(self._INSERT_PRICE, self._price_row(
+                    market_slug, outcome, price, best_bid, best_ask, timestamp
+                ))
+                self.conn.commit()
+            except Exception as e:
+                print(f"Error saving price: {e}")
+
+    def save_batch(self, items: List[tuple]):
+        """Save a batch of queued writes in a single transaction.
 
-        try:
-            self.conn.execute("""
-                INSERT INTO prices
-                (timestamp, timestamp_iso, market_slug, outcome, price, best_bid, best_ask, session_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                timestamp,
-                datetime.fromtimestamp(timestamp).isoformat(),
-                market_slug,
-                outcome,
-                price,
-                best_bid,
-                best_ask,
-                self.session_id
-            ))
-            self.conn.commit()
-        except Exception as e:
-            print(f"Error saving price: {e}")
+        Args:
+            items: (kind, payload) pairs where kind is "trade", "position",
+                   "market" (model payloads), "price" (save_price_update kwargs)
+                   or "completed" ((slug, completed_at, total_trades) tuples)
+        """
+        with self._lock:
+            trades = []
+            trade_keys = set()  # Recorded as saved only once the batch commits
+            positions = {}  # Only the latest snapshot per wallet/market is kept
+            markets = {}
+            prices = []
+            completed = []
+
+            for kind, payload in items:
+                if kind == "trade":
+                    trade_key = self._trade_key(payload)
+                    if trade_key in self.session_trade_ids or trade_key in trade_keys:
+                        continue  # Skip duplicate
+                    trade_keys.add(trade_key)
+                    trades.append(self._trade_row(payload))
+                elif kind == "position":
+                    positions[(payload.wallet.lower(), payload.market_slug)] = self._position_row(payload)
+                elif kind == "market":
+                    markets[payload.slug] = self._market_row(payload)
+                elif kind == "price":
+                    prices.append(self._price_row(**payload))
+                elif kind == "completed":
+                    completed.append(payload)
+
+            try:
+                with self.conn:
+                    if trades:
+                        self.conn.executemany(self._INSERT_TRADE, trades)
+                    if positions:
+                        self.conn.executemany(self._UPSERT_POSITION, positions.values())
+                    if markets:
+                        self.conn.executemany(self._UPSERT_MARKET, markets.values())
+                    if prices:
+                        self.conn.executemany(self._INSERT_PRICE, prices)
+                    if completed:
+                        self.conn.executemany(self._UPSERT_COMPLETED, completed)
+                self.session_trade_ids.update(trade_keys)
+            except Exception as e:
+                print(f"Error saving batch of {len(items)} writes: {e}")
 
     def get_all_trades(self) -> List[dict]:
         """Get all trades."""
-        cursor = self.conn.execute("""
-            SELECT * FROM trades ORDER BY timestamp DESC
-        """)
-        return [dict(row) for row in cursor.fetchall()]
+        with self._lock:
+            cursor = self.conn.execute("""
+                SELECT * FROM trades ORDER BY timestamp DESC
+            """)
+            return [dict(row) for row in cursor.fetchall()]
 
     def get_all_positions(self) -> Dict[str, dict]:
         """Get all positions as dict keyed by wallet:market_slug."""
-        cursor = self.conn.execute("SELECT * FROM positions")
-        positions = {}
-        for row in cursor.fetchall():
-            pos = dict(row)
-            key = f"{pos['wallet']}:{pos['market_slug']}"
-            positions[key] = pos
-        return positions
+        with self._lock:
+            cursor = self.conn.execute("SELECT * FROM positions")
+            positions = {}
+            for row in cursor.fetchall():
+                pos = dict(row)
+                key = f"{pos['wallet']}:{pos['market_slug']}"
+                positions[key] = pos
+            return positions
 
     def get_all_markets(self) -> Dict[str, dict]:
         """Get all markets as dict keyed by slug."""
-        cursor = self.conn.execute("SELECT * FROM markets")
-        markets = {}
-        for row in cursor.fetchall():
-            market = dict(row)
-            # Parse JSON fields
-            market['token_ids'] = json.loads(market.get('token_ids', '{}'))
-            market['outcomes'] = json.loads(market.get('outcomes', '[]'))
-            market['resolved'] = bool(market.get('resolved', 0))
-            markets[market['slug']] = market
-        return markets
+        with self._lock:
+            cursor = self.conn.execute("SELECT * FROM markets")
+            markets = {}
+            for row in cursor.fetchall():
+                market = dict(row)
+                # Parse JSON fields
+                market['token_ids'] = json.loads(market.get('token_ids', '{}'))
+                market['outcomes'] = json.loads(market.get('outcomes', '[]'))
+                market['resolved'] = bool(market.get('resolved', 0))
+                markets[market['slug']] = market
+            return markets
+
+    def get_completed_markets(self, since: int = 0) -> Dict[str, int]:
+        """Get resolver-completed markets as {slug: completed_at}, completed at or after since."""
+        with self._lock:
+            cursor = self.conn.execute(
+                "SELECT slug, completed_at FROM completed_markets WHERE completed_at >= ?",
+                (since,)
+            )
+            return {row["slug"]: row["completed_at"] for row in cursor.fetchall()}
 
     def get_all_prices(self) -> List[dict]:
         """Get all price snapshots."""
-        cursor = self.conn.execute("""
-            SELECT * FROM prices ORDER BY timestamp DESC LIMIT 10000
-        """)
-        return [dict(row) for row in cursor.fetchall()]
+        with self._lock:
+            cursor = self.conn.execute("""
+                SELECT * FROM prices ORDER BY timestamp DESC LIMIT 10000
+            """)
+            return [dict(row) for row in cursor.fetchall()]
 
     def get_prices_for_market(self, market_slug: str) -> List[dict]:
         """Get price snapshots for a specific market."""
-        cursor = self.conn.execute("""
-            SELECT * FROM prices WHERE market_slug = ? ORDER BY timestamp DESC LIMIT 1000
-        """, (market_slug,))
-        return [dict(row) for row in cursor.fetchall()]
+        with self._lock:
+            cursor = self.conn.execute("""
+                SELECT * FROM prices WHERE market_slug = ? ORDER BY timestamp DESC LIMIT 1000
+            """, (market_slug,))
+            return [dict(row) for row in cursor.fetchall()]
 
     def cleanup_old_prices(self, days: int = 7):
         """Delete prices older than specified days."""
-        cutoff = int((datetime.now() - timedelta(days=days)).timestamp())
-        try:
-            cursor = self.conn.execute("""
-                DELETE FROM prices WHERE timestamp < ?
-            """, (cutoff,))
-            deleted = cursor.rowcount
-            self.conn.commit()
-            if deleted > 0:
-                print(f"Cleaned up {deleted} old price records")
-            return deleted
-        except Exception as e:
-            print(f"Error cleaning up prices: {e}")
-            return 0
+        with self._lock:
+            cutoff = int((datetime.now() - timedelta(days=days)).timestamp())
+            try:
+                cursor = self.conn.execute("""
+                    DELETE FROM prices WHERE timestamp < ?
+                """, (cutoff,))
+                deleted = cursor.rowcount
+                self.conn.commit()
+                if deleted > 0:
+                    print(f"Cleaned up {deleted} old price records")
+                return deleted
+            except Exception as e:
+                print(f"Error cleaning up prices: {e}")
+                return 0
 
     def get_session_summary(self) -> dict:
         """Get summary of current session."""
-        trades_count = self.conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
-        positions_count = self.conn.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
-        markets_count = self.conn.execute("SELECT COUNT(*) FROM markets").fetchone()[0]
-
-        return {
-            "session_id": self.session_id,
-            "db_dir": str(self.db_dir),
-            "db_path": str(self.db_path),
-            "session_trades_count": len(self.session_trade_ids),
-            "total_trades_count": trades_count,
-            "total_markets_count": markets_count,
-            "total_positions_count": positions_count
-        }
+        with self._lock:
+            trades_count = self.conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+            positions_count = self.conn.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+            markets_count = self.conn.execute("SELECT COUNT(*) FROM markets").fetchone()[0]
+
+            return {
+                "session_id": self.session_id,
+                "db_dir": str(self.db_dir),
+                "db_path": str(self.db_path),
+                "session_trades_count": len(self.session_trade_ids),
+                "total_trades_count": trades_count,
+                "total_markets_count": markets_count,
+                "total_positions_count": positions_count
+            }
 
     def create_manual_backup(self) -> Optional[str]:
         """Create a manual backup (can be called via API)."""
@@ -600,62 +723,65 @@ class SQLiteStorage:
 
     def flush(self):
         """Update session end time and create shutdown backup."""
-        try:
-            self.conn.execute("""
-                UPDATE sessions SET ended_at = ?, trades_count = ?
-                WHERE session_id = ?
-            """, (datetime.now().isoformat(), len(self.session_trade_ids), self.session_id))
-            self.conn.commit()
+        with self._lock:
+            try:
+                self.conn.execute("""
+                    UPDATE sessions SET ended_at = ?, trades_count = ?
+                    WHERE session_id = ?
+                """, (datetime.now().isoformat(), len(self.session_trade_ids), self.session_id))
+                self.conn.commit()
 
-            # Create shutdown backup
-            self._create_backup("shutdown")
+                # Create shutdown backup
+                self._create_backup("shutdown")
 
-            # Clean up old prices
-            self.cleanup_old_prices()
+                # Clean up old prices
+                self.cleanup_old_prices()
 
-            summary = self.get_session_summary()
-            print(f"\nSession {self.session_id} saved: {summary['session_trades_count']} trades")
-            print(f"Database: {summary['db_path']}")
-        except Exception as e:
-            print(f"Error during flush: {e}")
+                summary = self.get_session_summary()
+                print(f"\nSession {self.session_id} saved: {summary['session_trades_count']} trades")
+                print(f"Database: {summary['db_path']}")
+            except Exception as e:
+                print(f"Error during flush: {e}")
 
     def clear_all(self) -> dict:
         """Clear all data from the database."""
-        try:
-            # Try to create backup first (but don't fail if it doesn't work)
-            backup_path = None
+        with self._lock:
             try:
-                backup_path = self._create_backup("pre_clear")
-            except Exception as be:
-                print(f"Backup failed (continuing anyway): {be}")
-
-            # Clear all tables (use try/except for each in case table doesn't exist)
-            tables = ["trades", "positions", "markets", "prices", "sessions"]
-            for table in tables:
+                # Try to create backup first (but don't fail if it doesn't work)
+                backup_path = None
                 try:
-                    self.conn.execute(f"DELETE FROM {table}")
-                except Exception as te:
-                    print(f"Could not clear {table}: {te}")
-
-            self.conn.commit()
-
-            # Clear in-memory cache
-            self.session_trade_ids.clear()
-
-            print("Database cleared")
-            return {
-                "success": True,
-                "backup_path": backup_path,
-                "message": "All data cleared"
-            }
-        except Exception as e:
-            print(f"Error clearing database: {e}")
-            return {
-                "success": False,
-                "error": str(e)
-            }
+                    backup_path = self._create_backup("pre_clear")
+                except Exception as be:
+                    print(f"Backup failed (continuing anyway): {be}")
+
+                # Clear all tables (use try/except for each in case table doesn't exist)
+                tables = ["trades", "positions", "markets", "prices", "sessions", "completed_markets"]
+                for table in tables:
+                    try:
+                        self.conn.execute(f"DELETE FROM {table}")
+                    except Exception as te:
+                        print(f"Could not clear {table}: {te}")
+
+                self.conn.commit()
+
+                # Clear in-memory cache
+                self.session_trade_ids.clear()
+
+                print("Database cleared")
+                return {
+                    "success": True,
+                    "backup_path": backup_path,
+                    "message": "All data cleared"
+                }
+            except Exception as e:
+                print(f"Error clearing database: {e}")
+                return {
+                    "success": False,
+                    "error": str(e)
+                }
 
     def close(self):
         """Close database connection."""
-        self.flush()
-        self.conn.close()
+        with self._lock:
+            self.flush()
+            self.conn.close()
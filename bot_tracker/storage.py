@@ -10,9 +10,27 @@ from typing import List, Optional, Dict
 from pathlib import Path
 from filelock import FileLock
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .models import TradeEvent, WalletPosition, MarketContext
 
 
+def _encode(data) -> bytes:
+    """Encode data as indented JSON (orjson if available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2, default=str)
+    return json.dumps(data, indent=2, default=str).encode()
+
+
+def _decode(raw: bytes):
+    """Decode JSON bytes (orjson if available)."""
+    return orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
+
+
 class JSONStorage:
     """Saves tracking data to consolidated JSON files."""
 
@@ -76,8 +94,7 @@ class JSONStorage:
         lock = FileLock(str(filepath) + ".lock")
         with lock:
             try:
-                with open(filepath, 'r') as f:
-                    return json.load(f)
+                return _decode(filepath.read_bytes())
             except (json.JSONDecodeError, FileNotFoundError):
                 return [] if filepath != self.positions_file and filepath != self.markets_file else {}
 
@@ -85,23 +102,20 @@ class JSONStorage:
         """Write JSON file with lock."""
         lock = FileLock(str(filepath) + ".lock")
         with lock:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            filepath.write_bytes(_encode(data))
 
     def _append_json(self, filepath: Path, item: dict):
         """Append item to JSON array file."""
         lock = FileLock(str(filepath) + ".lock")
         with lock:
             try:
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
+                data = _decode(filepath.read_bytes())
             except (json.JSONDecodeError, FileNotFoundError):
                 data = []
 
             data.append(item)
 
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
+            filepath.write_bytes(_encode(data))
 
     def _record_session_start(self):
         """Record new session in sessions file."""
@@ -232,6 +246,18 @@ class JSONStorage:
         }
         self._append_json(self.prices_file, price_dict)
 
+    def save_batch(self, items: List[tuple]):
+        """Save queued (kind, payload) writes (same interface as SQLiteStorage)."""
+        for kind, payload in items:
+            if kind == "trade":
+                self.save_trade(payload)
+            elif kind == "position":
+                self.save_position(payload)
+            elif kind == "market":
+                self.save_market(payload)
+            elif kind == "price":
+                self.save_price_update(**payload)
+
     def get_all_prices(self) -> List[dict]:
         """Get all price snapshots from consolidated file."""
         return self._read_json(self.prices_file)
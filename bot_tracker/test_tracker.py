@@ -8,8 +8,7 @@ import asyncio
 import aiohttp
 from datetime import datetime
 
-from .config import POLYMARKET_DATA_API, TARGET_WALLETS, MARKET_SLUGS_PATTERN
-import re
+from .config import POLYMARKET_DATA_API, TARGET_WALLETS, MARKET_SLUGS_RE
 
 
 async def test_trades_api():
@@ -44,7 +43,7 @@ async def test_trades_api():
                         # Filter to BTC/ETH 15-min markets
                         filtered = [
                             t for t in trades
-                            if re.match(MARKET_SLUGS_PATTERN, t.get("slug", ""))
+                            if MARKET_SLUGS_RE.match(t.get("slug", ""))
                         ]
                         print(f"BTC/ETH 15-min trades: {len(filtered)}")
                         print()
@@ -116,7 +115,7 @@ async def test_positions_api():
                         # Filter to BTC/ETH 15-min markets
                         filtered = [
                             p for p in positions
-                            if re.match(MARKET_SLUGS_PATTERN, p.get("slug", ""))
+                            if MARKET_SLUGS_RE.match(p.get("slug", ""))
                         ]
                         print(f"BTC/ETH 15-min positions: {len(filtered)}")
                         print()
@@ -12,7 +12,7 @@ from datetime import datetime
 from .config import (
     POLYMARKET_DATA_API, GAMMA_API, TARGET_WALLETS,
     TRADE_POLL_INTERVAL, REQUEST_TIMEOUT,
-    MARKET_SLUGS_PATTERN, MARKET_FILTER_ENABLED, BUY_ONLY
+    MARKET_SLUGS_PATTERN, MARKET_FILTER_ENABLED, BUY_ONLY, slug_matches
 )
 from .models import TradeEvent
 
@@ -106,6 +106,8 @@ class TradePoller:
         offset = 0
         limit = 500  # Max allowed by API
         api_calls = 0
+        # Compile once rather than per trade
+        market_match = re.compile(market_filter).match if market_filter else None
 
         while api_calls < max_api_calls:
             params = {
@@ -135,8 +137,8 @@ class TradePoller:
                 break
 
             # Filter to target markets if specified
-            if market_filter:
-                filtered = [t for t in raw_trades if re.match(market_filter, t.get("slug", ""))]
+            if market_match:
+                filtered = [t for t in raw_trades if market_match(t.get("slug", ""))]
             else:
                 filtered = raw_trades
 
@@ -179,9 +181,8 @@ class TradePoller:
         market_question = raw.get("title", "")
 
         # Apply market filter
-        if MARKET_FILTER_ENABLED and market_slug:
-            if not re.match(MARKET_SLUGS_PATTERN, market_slug):
-                return None
+        if market_slug and not slug_matches(market_slug):
+            return None
 
         return TradeEvent(
             id=trade_id,
@@ -9,12 +9,24 @@ from datetime import datetime
 
 try:
     import websockets
-    from websockets.server import serve, WebSocketServerProtocol
+    # Top-level serve() and broadcast() always come from the same implementation
+    from websockets import serve
     WEBSOCKETS_AVAILABLE = True
 except ImportError:
     WEBSOCKETS_AVAILABLE = False
     print("Warning: websockets not installed. Run: pip install websockets")
 
+try:
+    from websockets import broadcast as ws_broadcast
+except ImportError:
+    ws_broadcast = None  # websockets missing or too old; send per client
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from .config import WEBSOCKET_HOST, WEBSOCKET_PORT
 from .models import TradeEvent, WalletPosition, MarketContext
 
@@ -59,18 +71,29 @@ class WebSocketServer:
         elif hasattr(data, "dict"):
             data = data.dict()
 
-        message = json.dumps({
+        message = {
             "type": message_type,
             "data": data,
             "timestamp": datetime.now().isoformat(),
             "sequence": self.message_count
-        }, default=str)
+        }
+        if ORJSON_AVAILABLE:
+            message = orjson.dumps(message, default=str).decode()
+        else:
+            message = json.dumps(message, default=str)
 
         self.message_count += 1
 
-        # Broadcast to all clients
+        # Frame the message once and write it to every open connection
+        # without awaiting each one; closed clients are skipped and removed
+        # by register()'s finally block
+        if ws_broadcast is not None:
+            ws_broadcast(tuple(self.clients), message)
+            return
+
+        # Iterate a snapshot: register() discards clients while we await sends
         disconnected = set()
-        for client in self.clients:
+        for client in tuple(self.clients):
             try:
                 await client.send(message)
             except Exception: